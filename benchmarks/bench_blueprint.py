@@ -0,0 +1,182 @@
+"""Coût des modèles du blueprint de notification.
+
+Avant : une automatisation par adresse se déclenche chaque jour à l'heure
+choisie et son modèle ``collectes_list`` parcourt six fois
+``device_entities()`` en lisant l'attribut ``jours_restants`` de chaque
+capteur. Après : l'intégration émet ``rn_collectes_upcoming_collection``
+seulement quand une collecte approche, et le modèle ne lit que les types
+fournis par l'événement.
+
+Pour 1, 50 et 500 adresses, le script mesure la durée de rendu de
+``collectes_list`` pour un déclenchement de chaque automatisation, puis le
+coût côté intégration : le recalcul du prochain rappel de chaque entrée
+(fait au changement de jour et à chaque mise à jour des données).
+
+Usage : python benchmarks/bench_blueprint.py
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import device_registry as dr, entity_registry as er  # noqa: E402
+from homeassistant.helpers.template import Template  # noqa: E402
+from homeassistant.util.yaml import load_yaml  # noqa: E402
+
+from custom_components.rn_collectes.const import COLLECTE_TYPES, DOMAIN, TIMEZONE  # noqa: E402
+from custom_components.rn_collectes.coordinator import summarize  # noqa: E402
+from custom_components.rn_collectes.notifier import CollectionNotifier  # noqa: E402
+from custom_components.rn_collectes.schedule import Schedule  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+BLUEPRINT = ROOT / "blueprints/automation/rn_collectes/notification_collecte.yaml"
+ENTRIES = (1, 50, 500)
+REPEAT = 5
+
+# Modèle de la version précédente du blueprint (déclencheur horaire)
+LEGACY_COLLECTES_LIST = "{% set ns = namespace(bacs=[], autres=[]) %}" + "".join(
+    f"""
+    {{% if notify_var %}}
+      {{% for entity in device_entities(collecte_address_var) %}}
+        {{% if '{slug}' in entity and state_attr(entity, 'jours_restants') == days_before_var %}}
+          {{% set ns.{bucket} = ns.{bucket} + ['{collecte_type}'] %}}
+        {{% endif %}}
+      {{% endfor %}}
+    {{% endif %}}"""
+    for slug, bucket, collecte_type in (
+        ("dechets", "bacs", "Déchets"),
+        ("recuperation", "bacs", "Récupération"),
+        ("compost", "bacs", "Compost"),
+        ("encombrants", "autres", "Encombrants"),
+        ("residus_verts", "autres", "Résidus verts"),
+        ("arbre_de_noel", "autres", "Arbre de Noël"),
+    )
+) + "{{ {'bacs': ns.bacs, 'autres': ns.autres} }}"
+
+
+def build_schedule(today: date) -> Schedule:
+    """Construire un an de collectes hebdomadaires pour chaque type."""
+    start = datetime.combine(today, time.min, tzinfo=TIMEZONE)
+    return Schedule.build(
+        (
+            (start + timedelta(days=7 * week + offset + 1)).timestamp(),
+            collecte_type,
+            "",
+            collecte_type,
+        )
+        for week in range(52)
+        for offset, collecte_type in enumerate(COLLECTE_TYPES)
+    )
+
+
+def _slug(collecte_type: str) -> str:
+    """Reproduire l'identifiant d'entité des capteurs."""
+    return (
+        collecte_type.lower()
+        .replace(" ", "_")
+        .translate(str.maketrans("éèêëîïôöûüç", "eeeeiioouuc"))
+    )
+
+
+async def bench(entries: int) -> dict[str, float]:
+    """Mesurer les deux modèles et le recalcul des rappels pour ``entries`` adresses."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        registry = er.async_get(hass)
+
+        today = datetime.now(TIMEZONE).date()
+        schedule = build_schedule(today)
+        for index in range(entries):
+            for collecte_type in COLLECTE_TYPES:
+                entity = registry.async_get_or_create(
+                    "sensor",
+                    DOMAIN,
+                    f"{index}_{collecte_type}",
+                    device_id=f"device{index}",
+                    suggested_object_id=f"{index}_{_slug(collecte_type)}",
+                )
+                summary = summarize(schedule, collecte_type, today)
+                hass.states.async_set(
+                    entity.entity_id, summary.native_value, summary.attributes
+                )
+
+        legacy = Template(LEGACY_COLLECTES_LIST, hass)
+        legacy.ensure_valid()
+        current = Template(
+            load_yaml(str(BLUEPRINT))["variables"]["collectes_list"], hass
+        )
+        current.ensure_valid()
+        trigger = {
+            "event": SimpleNamespace(
+                data={"jours_restants": 1, "types": ["Déchets", "Récupération"]}
+            )
+        }
+        toggles = {f"notify_{name}_var": True for name in (
+            "dechets", "recuperation", "compost", "encombrants", "residus_verts", "arbre_noel"
+        )}
+
+        # Un déclenchement de chaque automatisation
+        start = perf_counter()
+        for _ in range(REPEAT):
+            for index in range(entries):
+                legacy.async_render(
+                    {
+                        "collecte_address_var": f"device{index}",
+                        "days_before_var": 1,
+                        "notify_var": True,
+                    }
+                )
+        legacy_ms = (perf_counter() - start) / REPEAT * 1000
+
+        start = perf_counter()
+        for _ in range(REPEAT):
+            for _ in range(entries):
+                current.async_render({**toggles, "trigger": trigger})
+        current_ms = (perf_counter() - start) / REPEAT * 1000
+
+        # Recalcul du prochain rappel de chaque entrée
+        coordinator = SimpleNamespace(data=schedule)
+        notifiers = [
+            CollectionNotifier(
+                hass,
+                SimpleNamespace(entry_id=str(index), title=str(index), options={}),
+                coordinator,
+            )
+            for index in range(entries)
+        ]
+        start = perf_counter()
+        for _ in range(REPEAT):
+            for notifier in notifiers:
+                notifier._async_schedule()  # pylint: disable=protected-access
+        schedule_ms = (perf_counter() - start) / REPEAT * 1000
+        for notifier in notifiers:
+            notifier.async_stop()
+
+        await hass.async_stop(force=True)
+
+    return {"legacy_ms": legacy_ms, "current_ms": current_ms, "schedule_ms": schedule_ms}
+
+
+def main() -> None:
+    """Afficher les mesures pour chaque nombre d'adresses."""
+    print(f"{'adresses':>8} {'modèle avant ms':>15} {'modèle après ms':>15} {'rappels ms':>10}")
+    for entries in ENTRIES:
+        result = asyncio.run(bench(entries))
+        print(
+            f"{entries:>8} {result['legacy_ms']:>15.1f} {result['current_ms']:>15.1f}"
+            f" {result['schedule_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Latence de CollectesCalendar.async_get_events.
+
+Compare la recherche par bisection sur des événements pré-construits au
+parcours linéaire d'origine, pour des calendriers de plusieurs années et de
+nombreuses entités.
+
+Usage : python benchmarks/bench_calendar.py
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+from time import perf_counter
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.components.calendar import CalendarEvent  # noqa: E402
+
+from custom_components.rn_collectes.calendar import CollectesCalendar  # noqa: E402
+from custom_components.rn_collectes.const import COLLECTE_TYPES, TIMEZONE  # noqa: E402
+from custom_components.rn_collectes.schedule import Schedule  # noqa: E402
+
+YEARS = (1, 3, 10)
+ENTITIES = (1, 50, 500)
+CALLS_PER_ENTITY = 20
+
+
+def build_rows(years: int) -> list[tuple[float, str, str, str]]:
+    """Construire des événements synthétiques : une collecte par type et par semaine."""
+    start = datetime(2025, 1, 6, tzinfo=TIMEZONE)
+    return [
+        (
+            (start + timedelta(days=7 * week + offset)).timestamp(),
+            collecte_type,
+            f"Collecte {collecte_type}",
+            collecte_type,
+        )
+        for week in range(52 * years)
+        for offset, collecte_type in enumerate(COLLECTE_TYPES)
+    ]
+
+
+async def linear_get_events(all_events, start_date, end_date) -> list[CalendarEvent]:
+    """Implémentation d'origine : parcours complet et construction à chaque appel."""
+    return [
+        CalendarEvent(
+            start=event_data['date'],
+            end=event_data['date'] + timedelta(days=1),
+            summary=event_data['summary'],
+            description=event_data.get('description', ''),
+        )
+        for event_data in all_events
+        if start_date <= event_data['date'] <= end_date
+    ]
+
+
+async def bench(years: int, entities: int) -> tuple[float, float]:
+    """Retourner la latence moyenne par appel (µs) : linéaire, bisection."""
+    rows = build_rows(years)
+    schedule = Schedule.build(rows)
+    all_events = [
+        {'date': datetime.fromtimestamp(timestamp, TIMEZONE), 'summary': summary, 'description': description}
+        for timestamp, summary, description, _ in sorted(rows)
+    ]
+    coordinator = SimpleNamespace(data=schedule)
+    entry = SimpleNamespace(entry_id="bench", data={"civic_number": "1"}, title="Bench")
+    calendars = [CollectesCalendar(coordinator, entry) for _ in range(entities)]
+
+    # Fenêtre d'un mois, comme la vue mensuelle du calendrier
+    start_date = datetime(2025, 6, 1, tzinfo=TIMEZONE)
+    end_date = start_date + timedelta(days=31)
+    calls = entities * CALLS_PER_ENTITY
+
+    begin = perf_counter()
+    for _ in range(CALLS_PER_ENTITY):
+        for _ in calendars:
+            await linear_get_events(all_events, start_date, end_date)
+    linear = (perf_counter() - begin) / calls
+
+    # Les CalendarEvent sont construits une fois par mise à jour du coordinateur
+    await calendars[0].async_get_events(None, start_date, end_date)
+
+    begin = perf_counter()
+    for _ in range(CALLS_PER_ENTITY):
+        for calendar in calendars:
+            await calendar.async_get_events(None, start_date, end_date)
+    indexed = (perf_counter() - begin) / calls
+
+    return linear * 1e6, indexed * 1e6
+
+
+async def main() -> None:
+    """Exécuter toutes les combinaisons."""
+    print(f"{'années':>6} {'entités':>8} {'linéaire µs':>12} {'bisection µs':>13} {'gain':>7}")
+    for years in YEARS:
+        for entities in ENTITIES:
+            linear, indexed = await bench(years, entities)
+            print(f"{years:>6} {entities:>8} {linear:>12.1f} {indexed:>13.1f} {linear / indexed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,213 @@
+"""Coordinateurs par entrée contre coordinateurs partagés par secteur.
+
+Pour 1, 50 et 500 adresses réparties sur 30 secteurs, contre le portail
+local (``portal.py``), compare :
+
+- ``entrée`` : un ``CollectesCoordinator`` par adresse (comportement d'origine)
+- ``secteur`` : ``SectorCoordinators``, un coordinateur par secteur
+
+Mesures : nombre de coordinateurs (et donc de minuteries de
+rafraîchissement), durée et CPU d'un cycle de rafraîchissement complet
+(cache expiré, calendriers inchangés), durée du recalcul des états au
+changement de jour et mémoire retenue par les coordinateurs.
+
+Le script vérifie aussi qu'un coordinateur partagé continue de rafraîchir
+après le déchargement de l'entrée qui l'a créé, et retourne un code de
+sortie non nul sinon.
+
+Usage : python benchmarks/bench_coordinators.py [profil]
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+from pathlib import Path
+import sys
+import tempfile
+from time import perf_counter, process_time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from bench_refresh import ENTRIES, expire  # noqa: E402
+from custom_components.rn_collectes import collector as collector_module  # noqa: E402
+from custom_components.rn_collectes.collector import (  # noqa: E402
+    CollectesCollector,
+    async_close_session,
+)
+from custom_components.rn_collectes.const import (  # noqa: E402
+    DATA_SESSION,
+    DATA_TOKEN_BUCKET,
+    DOMAIN,
+)
+from custom_components.rn_collectes.coordinator import (  # noqa: E402
+    CollectesCoordinator,
+    async_get_sector_coordinators,
+)
+from custom_components.rn_collectes.metrics import async_get_collector_stats  # noqa: E402
+from custom_components.rn_collectes.ratelimit import TokenBucket  # noqa: E402
+from portal import start_portal  # noqa: E402
+
+
+async def _per_entry(
+    hass: HomeAssistant, collectors: list[CollectesCollector]
+) -> list[CollectesCoordinator]:
+    """Créer un coordinateur par adresse."""
+    coordinators = [
+        CollectesCoordinator(hass, collector.async_get_collectes) for collector in collectors
+    ]
+    await asyncio.gather(*(c.async_config_entry_first_refresh() for c in coordinators))
+    return coordinators
+
+
+async def _per_sector(
+    hass: HomeAssistant, collectors: list[CollectesCollector]
+) -> list[CollectesCoordinator]:
+    """Rattacher chaque adresse au coordinateur de son secteur."""
+    registry = async_get_sector_coordinators(hass)
+
+    async def acquire(index: int, collector: CollectesCollector) -> CollectesCoordinator:
+        ics_url = await collector.async_known_ics_url()
+        return await registry.async_acquire(str(index), ics_url, collector)
+
+    return await asyncio.gather(
+        *(acquire(index, collector) for index, collector in enumerate(collectors))
+    )
+
+
+async def bench(base_url: str, entries: int, mode: str) -> dict[str, float]:
+    """Mesurer un mode pour ``entries`` adresses."""
+    collector_module.BASE_URL = base_url
+    setup = _per_entry if mode == "entrée" else _per_sector
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.data[DATA_TOKEN_BUCKET] = TokenBucket(rate=1e9, capacity=1e9)
+        collectors = [
+            CollectesCollector(hass, street="Rue 1", civic_number=str(civic))
+            for civic in range(entries)
+        ]
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        coordinators = await setup(hass, collectors)
+        unique = list({id(c): c for c in coordinators}.values())
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        # Un cycle d'intervalle : chaque coordinateur rafraîchit une fois
+        expire(hass)
+        cpu, wall = process_time(), perf_counter()
+        await asyncio.gather(*(c.async_refresh() for c in unique))
+        wall, cpu = perf_counter() - wall, process_time() - cpu
+
+        start = perf_counter()
+        for coordinator in unique:
+            coordinator.async_day_changed()
+        day_changed = perf_counter() - start
+
+        connector = hass.data[DATA_SESSION].connector
+        async_close_session(hass)
+        await connector.close()
+        await hass.async_stop(force=True)
+
+    return {
+        "coordinators": len(unique),
+        "refresh_ms": wall * 1000,
+        "cpu_ms": cpu * 1000,
+        "day_ms": day_changed * 1000,
+        "retained_kib": retained / 1024,
+    }
+
+
+async def check_entry_unload(base_url: str) -> bool:
+    """Vérifier que le coordinateur partagé survit à l'entrée qui l'a créé."""
+    collector_module.BASE_URL = base_url
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.data[DATA_TOKEN_BUCKET] = TokenBucket(rate=1e9, capacity=1e9)
+        registry = async_get_sector_coordinators(hass)
+
+        # Deux adresses du même secteur, configurées comme par Home Assistant
+        entries = [
+            config_entries.ConfigEntry(
+                version=1, minor_version=1, domain=DOMAIN, title=civic, data={}, source="user"
+            )
+            for civic in ("1", "31")
+        ]
+        coordinators = []
+        for entry in entries:
+            collector = CollectesCollector(hass, street="Rue 1", civic_number=entry.title)
+            config_entries.current_entry.set(entry)
+            coordinators.append(
+                await registry.async_acquire(
+                    entry.entry_id, await collector.async_known_ics_url(), collector
+                )
+            )
+        config_entries.current_entry.set(None)
+
+        # Déchargement de la première entrée
+        await entries[0]._async_process_on_unload(hass)
+        await registry.async_release(entries[0].entry_id)
+
+        # Rafraîchissement planifié du coordinateur restant
+        stats = async_get_collector_stats(hass)
+        before = stats.counters["downloads"] + stats.counters["not_modified"]
+        expire(hass)
+        coordinator = coordinators[1]
+        await coordinator._handle_refresh_interval(dt_util.utcnow())
+        refreshed = (
+            coordinators[0] is coordinator
+            and coordinator.last_update_success
+            and stats.counters["downloads"] + stats.counters["not_modified"] > before
+        )
+
+        await registry.async_release(entries[1].entry_id)
+        connector = hass.data[DATA_SESSION].connector
+        async_close_session(hass)
+        await connector.close()
+        await hass.async_stop(force=True)
+
+    return refreshed
+
+
+def main() -> int:
+    """Comparer les deux modes pour chaque nombre d'adresses."""
+    logging.basicConfig(level=logging.CRITICAL)
+    profile = sys.argv[1] if len(sys.argv) > 1 else "medium"
+    print(
+        f"{'adresses':>8} {'mode':>8} {'coordinateurs':>13} {'cycle ms':>9}"
+        f" {'CPU ms':>8} {'minuit ms':>9} {'mémoire Kio':>11}"
+    )
+    process, base_url = start_portal(profile)
+    try:
+        for entries in ENTRIES:
+            for mode in ("entrée", "secteur"):
+                result = asyncio.run(bench(base_url, entries, mode))
+                print(
+                    f"{entries:>8} {mode:>8} {result['coordinators']:>13}"
+                    f" {result['refresh_ms']:>9.0f} {result['cpu_ms']:>8.0f}"
+                    f" {result['day_ms']:>9.1f} {result['retained_kib']:>11.0f}"
+                )
+        refreshed = asyncio.run(check_entry_unload(base_url))
+    finally:
+        process.terminate()
+        process.join()
+
+    if not refreshed:
+        print("ÉCHEC : le coordinateur partagé ne rafraîchit plus après le déchargement")
+        print("        de l'entrée qui l'a créé")
+        return 1
+    print("OK : le coordinateur partagé survit au déchargement de la première entrée")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Coût d'importation de l'intégration et du premier parsing.
+
+Chaque mesure est faite dans un nouvel interpréteur : les modules de Home
+Assistant utilisés par l'intégration sont importés d'abord, puis seul
+l'import de l'intégration (et de ses plateformes) est chronométré. Le script
+indique aussi quelles bibliothèques de parsing sont chargées à ce moment, et
+la durée du premier parsing par le lecteur rapide et par les bibliothèques.
+
+Retourne un code de sortie non nul si la médiane de l'import dépasse le
+budget, pour repérer les régressions au démarrage.
+
+Usage : python benchmarks/bench_import.py [budget_ms]
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from statistics import median
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+RUNS = 7
+BUDGET_MS = 40.0
+
+# Bibliothèques lourdes qui ne doivent pas être chargées par l'import seul
+HEAVY_MODULES = ("icalendar", "recurring_ical_events", "x_wr_timezone")
+
+_PRELUDE = f"""
+import json, sys
+from time import perf_counter
+sys.path.insert(0, {str(ROOT)!r})
+sys.path.insert(0, {str(ROOT / "benchmarks")!r})
+import homeassistant.core
+import homeassistant.config_entries
+import homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.config_validation
+import homeassistant.helpers.update_coordinator
+import homeassistant.components.calendar
+import homeassistant.components.sensor
+import homeassistant.components.diagnostics
+"""
+
+_IMPORT = _PRELUDE + f"""
+start = perf_counter()
+import custom_components.rn_collectes
+import custom_components.rn_collectes.config_flow
+import custom_components.rn_collectes.sensor
+import custom_components.rn_collectes.calendar
+import custom_components.rn_collectes.diagnostics
+elapsed = perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+_FIRST_PARSE = _PRELUDE + """
+from fixtures import build_ics
+from custom_components.rn_collectes.parser import expand_ics
+content = build_ics(1, "medium", 1)
+if sys.argv[1] == "library":
+    # Un fuseau explicite oblige le repli sur les bibliothèques
+    content = content.replace(b"DTSTART;VALUE=DATE:", b"DTSTART;TZID=America/Toronto;VALUE=DATE:")
+start = perf_counter()
+expansion, _ = expand_ics(content)
+first = perf_counter() - start
+start = perf_counter()
+expand_ics(content)
+second = perf_counter() - start
+print(json.dumps({"first": first * 1000, "second": second * 1000, "scanned": expansion.scanned}))
+"""
+
+
+def _run(code: str, *args: str) -> dict:
+    """Exécuter ``code`` dans un nouvel interpréteur et lire son résultat JSON."""
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """Mesurer et comparer au budget."""
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+
+    runs = [_run(_IMPORT) for _ in range(RUNS)]
+    timings = sorted(run["ms"] for run in runs)
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    import_ms = median(timings)
+    print(f"import de l'intégration ({RUNS} interpréteurs) :")
+    print(f"  médiane {import_ms:.1f} ms, min {timings[0]:.1f} ms, max {timings[-1]:.1f} ms")
+    print(f"  bibliothèques lourdes chargées : {', '.join(loaded) or 'aucune'}")
+
+    print("premier parsing (calendrier medium) :")
+    for path in ("scanner", "library"):
+        parse = _run(_FIRST_PARSE, path)
+        print(
+            f"  {path:>8} : premier {parse['first']:7.1f} ms, suivant {parse['second']:7.1f} ms"
+            f" (lecteur rapide : {'oui' if parse['scanned'] else 'non'})"
+        )
+
+    if import_ms > budget:
+        print(f"ÉCHEC : import {import_ms:.1f} ms > budget {budget:.1f} ms")
+        return 1
+    if loaded:
+        print(f"ÉCHEC : import charge {', '.join(loaded)}")
+        return 1
+    print(f"OK : import {import_ms:.1f} ms <= budget {budget:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
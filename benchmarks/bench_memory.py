@@ -0,0 +1,79 @@
+"""Mémoire occupée par les calendriers parsés.
+
+Compare la représentation d'origine (un dict par événement, partagé entre
+``all_events`` et les listes par type, avec un datetime par événement) au
+stockage compact ``Schedule``, pour de nombreux calendriers d'un an.
+
+Usage : python benchmarks/bench_memory.py
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import gc
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.rn_collectes.const import COLLECTE_TYPES, TIMEZONE  # noqa: E402
+from custom_components.rn_collectes.schedule import Schedule  # noqa: E402
+
+CALENDARS = (1, 50, 500)
+
+
+def build_rows(calendar: int) -> list[tuple[float, str, str, str]]:
+    """Construire un an de collectes hebdomadaires pour un calendrier."""
+    start = datetime(2025, 1, 6, tzinfo=TIMEZONE)
+    return [
+        (
+            (start + timedelta(days=7 * week + offset)).timestamp(),
+            # Chaînes recréées pour chaque événement, comme str(event.get(...))
+            "".join(["Collecte ", collecte_type]),
+            "".join(["Secteur ", str(calendar), " - ", collecte_type]),
+            collecte_type,
+        )
+        for week in range(52)
+        for offset, collecte_type in enumerate(COLLECTE_TYPES)
+    ]
+
+
+def build_dicts(rows) -> dict[str, any]:
+    """Représentation d'origine retournée par _parse_ics."""
+    collectes = {collecte_type: [] for collecte_type in COLLECTE_TYPES}
+    all_events = []
+    for timestamp, summary, description, collecte_type in rows:
+        event_data = {
+            'date': datetime.fromtimestamp(timestamp, TIMEZONE),
+            'summary': summary,
+            'description': description,
+        }
+        all_events.append(event_data)
+        collectes[collecte_type].append(event_data)
+    return {'collectes': collectes, 'all_events': all_events, 'last_update': datetime.now()}
+
+
+def measure(build, count: int) -> int:
+    """Retourner la mémoire retenue (octets) par ``count`` calendriers."""
+    rows = [build_rows(calendar) for calendar in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    kept = [build(calendar_rows) for calendar_rows in rows]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    """Mesurer les deux représentations."""
+    print(f"{'calendriers':>11} {'dicts Kio':>10} {'Schedule Kio':>13} {'gain':>7}")
+    for count in CALENDARS:
+        before = measure(build_dicts, count)
+        after = measure(lambda rows: Schedule.build(rows, datetime.now()), count)
+        print(f"{count:>11} {before / 1024:>10.0f} {after / 1024:>13.0f} {before / after:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Volume écrit dans la base du recorder par les capteurs.
+
+Simule 30 jours de fonctionnement (une écriture d'état par capteur et par
+jour, au changement de jour) et mesure la taille des attributs que le
+recorder enregistre, avec et sans ``_unrecorded_attributes``.
+
+Le recorder déduplique les attributs : chaque ligne de ``states`` pointe
+vers une ligne de ``state_attributes`` dont ``shared_attrs`` n'est écrit
+qu'une fois par contenu distinct. Seuls les contenus distincts sont donc
+comptés ; la taille brute (toutes écritures confondues) est affichée à
+titre de comparaison. Les lignes de ``states`` elles-mêmes sont identiques
+avant et après et ne sont pas comptées.
+
+Usage : python benchmarks/bench_recorder.py
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.const import ATTR_FRIENDLY_NAME, ATTR_ICON  # noqa: E402
+from homeassistant.helpers.json import json_bytes  # noqa: E402
+
+from custom_components.rn_collectes.const import COLLECTE_TYPES, TIMEZONE  # noqa: E402
+from custom_components.rn_collectes.coordinator import summarize  # noqa: E402
+from custom_components.rn_collectes.schedule import Schedule  # noqa: E402
+from custom_components.rn_collectes.sensor import CollecteSensor  # noqa: E402
+
+ENTRIES = (1, 50, 500)
+DAYS = 30
+
+
+def build_schedule() -> Schedule:
+    """Construire un an de collectes hebdomadaires pour chaque type."""
+    start = datetime(2025, 1, 6, tzinfo=TIMEZONE)
+    rows = [
+        (
+            (start + timedelta(days=7 * week + offset)).timestamp(),
+            f"Collecte {collecte_type}",
+            f"Mettre le bac {collecte_type.lower()} au chemin avant 7 h",
+            collecte_type,
+        )
+        for week in range(52)
+        for offset, collecte_type in enumerate(COLLECTE_TYPES)
+    ]
+    return Schedule.build(rows, last_update=datetime.now())
+
+
+def recorded_bytes(
+    schedule: Schedule, entries: int, excluded: frozenset[str]
+) -> tuple[int, int, int]:
+    """Retourner la taille brute, le nombre et la taille des attributs distincts.
+
+    Les écritures couvrent ``DAYS`` jours ; comme dans ``state_attributes``,
+    un contenu déjà enregistré n'est pas écrit de nouveau.
+    """
+    total = 0
+    distinct: set[bytes] = set()
+    for day in range(DAYS):
+        today = date(2025, 3, 1) + timedelta(days=day)
+        summaries = [
+            (collecte_type, summarize(schedule, collecte_type, today))
+            for collecte_type in COLLECTE_TYPES
+        ]
+        for entry in range(entries):
+            for collecte_type, summary in summaries:
+                attributes = {
+                    key: value
+                    for key, value in summary.attributes.items()
+                    if key not in excluded
+                }
+                attributes[ATTR_FRIENDLY_NAME] = f"{entry} - {collecte_type}"
+                attributes[ATTR_ICON] = "mdi:trash-can"
+                payload = json_bytes(attributes)
+                total += len(payload)
+                distinct.add(payload)
+    return total, len(distinct), sum(len(payload) for payload in distinct)
+
+
+def main() -> None:
+    """Comparer les attributs enregistrés avant et après."""
+    schedule = build_schedule()
+    excluded = CollecteSensor._unrecorded_attributes
+    print(f"Attributs exclus : {', '.join(sorted(excluded))}")
+    print(
+        f"{'entrées':>8} {'brut avant':>11} {'brut après':>11}"
+        f" {'distincts':>15} {'avant Kio':>10} {'après Kio':>10} {'gain':>7}"
+    )
+    for entries in ENTRIES:
+        raw_before, count_before, before = recorded_bytes(schedule, entries, frozenset())
+        raw_after, count_after, after = recorded_bytes(schedule, entries, excluded)
+        print(
+            f"{entries:>8} {raw_before / 1024:>10.0f}K {raw_after / 1024:>10.0f}K"
+            f" {count_before:>7}/{count_after:<7} {before / 1024:>10.0f} {after / 1024:>10.0f}"
+            f" {before / after:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
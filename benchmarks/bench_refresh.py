@@ -0,0 +1,151 @@
+"""Coût des rafraîchissements de bout en bout, sans accès au portail réel.
+
+Démarre le portail local (``portal.py``) dans un processus séparé, puis
+mesure pour 1, 50 et 500 adresses réparties sur 30 secteurs et pour chaque
+profil de calendrier (``fixtures.py``) :
+
+- ``initial`` : résolution des adresses, téléchargement et parsing
+- ``revalidate`` : cache expiré, calendrier inchangé (304)
+- ``changed`` : cache expiré, nouvelle version de tous les calendriers
+
+Pour chaque scénario : durée totale, latence par adresse (p50/p95), CPU du
+processus (boucle et exécuteur), blocage maximal de la boucle et pic de
+mémoire (passe séparée sous ``tracemalloc``). Le seau à jetons est relâché
+pour mesurer le coût propre de l'intégration plutôt que la limite de débit.
+
+Usage : python benchmarks/bench_refresh.py [profil ...]
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+from time import perf_counter, process_time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiohttp  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.rn_collectes import collector as collector_module  # noqa: E402
+from custom_components.rn_collectes.cache import async_get_sector_cache  # noqa: E402
+from custom_components.rn_collectes.collector import (  # noqa: E402
+    CollectesCollector,
+    async_close_session,
+)
+from custom_components.rn_collectes.const import DATA_SESSION, DATA_TOKEN_BUCKET  # noqa: E402
+from custom_components.rn_collectes.metrics import LoopLagMonitor  # noqa: E402
+from custom_components.rn_collectes.ratelimit import TokenBucket  # noqa: E402
+from fixtures import PROFILES  # noqa: E402
+from portal import start_portal  # noqa: E402
+
+ENTRIES = (1, 50, 500)
+SECTORS = 30
+
+
+async def run_scenario(
+    hass: HomeAssistant, collectors: list[CollectesCollector], memory: bool = False
+) -> dict[str, float]:
+    """Rafraîchir toutes les adresses et mesurer le coût."""
+    latencies: list[float] = []
+
+    async def refresh(collector: CollectesCollector) -> None:
+        start = perf_counter()
+        await collector.async_get_collectes()
+        latencies.append(perf_counter() - start)
+
+    monitor = LoopLagMonitor(hass, interval=0.005, threshold=0.05)
+    if memory:
+        tracemalloc.start()
+    monitor.async_start()
+    cpu, wall = process_time(), perf_counter()
+    await asyncio.gather(*(refresh(collector) for collector in collectors))
+    wall, cpu = perf_counter() - wall, process_time() - cpu
+    monitor.async_stop()
+
+    result = {
+        "wall_ms": wall * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000,
+        "cpu_ms": cpu * 1000,
+        "max_lag_ms": monitor.max_lag * 1000,
+    }
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mib"] = peak / 2**20
+    return result
+
+
+def expire(hass: HomeAssistant) -> None:
+    """Rendre toutes les entrées du cache de secteurs périmées."""
+    cache = async_get_sector_cache(hass)
+    for sector in range(SECTORS):
+        if (entry := cache.get(str(sector))) is not None:
+            entry.fetched_at = dt_util.utcnow() - timedelta(days=1)
+
+
+async def bench(base_url: str, entries: int, memory: bool) -> dict[str, dict[str, float]]:
+    """Mesurer les trois scénarios pour ``entries`` adresses."""
+    collector_module.BASE_URL = base_url
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.data[DATA_TOKEN_BUCKET] = TokenBucket(rate=1e9, capacity=1e9)
+        collectors = [
+            CollectesCollector(hass, street="Rue 1", civic_number=str(civic))
+            for civic in range(entries)
+        ]
+
+        results["initial"] = await run_scenario(hass, collectors, memory)
+        expire(hass)
+        results["revalidate"] = await run_scenario(hass, collectors)
+        async with aiohttp.ClientSession() as session:
+            await session.post(f"{base_url}/_bench/version")
+        expire(hass)
+        results["changed"] = await run_scenario(hass, collectors)
+
+        connector = hass.data[DATA_SESSION].connector
+        async_close_session(hass)
+        await connector.close()
+        await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    """Exécuter les mesures pour chaque profil et nombre d'adresses."""
+    logging.basicConfig(level=logging.CRITICAL)
+    profiles = sys.argv[1:] or list(PROFILES)
+    print(
+        f"{'profil':>7} {'adresses':>8} {'scénario':>10} {'total ms':>9} {'p50 ms':>8}"
+        f" {'p95 ms':>8} {'CPU ms':>8} {'blocage ms':>10} {'pic Mio':>8}"
+    )
+    for profile in profiles:
+        process, base_url = start_portal(profile)
+        try:
+            for entries in ENTRIES:
+                results = asyncio.run(bench(base_url, entries, memory=False))
+                # Passe séparée : tracemalloc ralentit l'exécution
+                memory = asyncio.run(bench(base_url, entries, memory=True))
+                results["initial"]["peak_mib"] = memory["initial"]["peak_mib"]
+                for scenario, result in results.items():
+                    peak = f"{result['peak_mib']:>8.1f}" if "peak_mib" in result else f"{'':>8}"
+                    print(
+                        f"{profile:>7} {entries:>8} {scenario:>10} {result['wall_ms']:>9.0f}"
+                        f" {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f}"
+                        f" {result['cpu_ms']:>8.0f} {result['max_lag_ms']:>10.1f} {peak}"
+                    )
+        finally:
+            process.terminate()
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Lecteur rapide (``scanner.py``) contre icalendar + recurring_ical_events.
+
+Vérifie d'abord que les deux chemins donnent exactement les mêmes
+occurrences (instants, résumés, descriptions, types) sur les calendriers de
+``fixtures.py`` et sur des cas particuliers, et que les fichiers non pris en
+charge passent bien par les bibliothèques. Mesure ensuite la durée de
+lecture et d'expansion d'une fenêtre de 365 jours.
+
+Usage : python benchmarks/bench_scanner.py
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.rn_collectes.parser import EventExpansion  # noqa: E402
+from custom_components.rn_collectes.schedule import Schedule  # noqa: E402
+from fixtures import PROFILES, build_ics  # noqa: E402
+
+REPEAT = 20
+
+
+def _calendar(*events: str) -> bytes:
+    """Assembler un calendrier à partir de VEVENT bruts."""
+    body = "".join(f"BEGIN:VEVENT\r\n{event.strip()}\r\nEND:VEVENT\r\n" for event in events)
+    return f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//FR\r\n{body}END:VCALENDAR\r\n".encode()
+
+
+# Cas lus par le lecteur rapide, autour de la date du jour pour chevaucher la fenêtre
+_MONDAY = date.today() - timedelta(days=date.today().weekday(), weeks=8)
+EDGE_CASES = {
+    "count": _calendar(
+        f"UID:1\r\nDTSTART;VALUE=DATE:{_MONDAY:%Y%m%d}\r\nSUMMARY:Compost\r\n"
+        "RRULE:FREQ=WEEKLY;COUNT=80;BYDAY=MO,TH\r\n"
+        f"EXDATE;VALUE=DATE:{_MONDAY + timedelta(weeks=9):%Y%m%d},{_MONDAY + timedelta(weeks=9, days=3):%Y%m%d}"
+    ),
+    "daily": _calendar(
+        f"UID:1\r\nDTSTART;VALUE=DATE:{_MONDAY:%Y%m%d}\r\nSUMMARY:Déchets\r\n"
+        "RRULE:FREQ=DAILY;INTERVAL=10"
+    ),
+    "text": _calendar(
+        f"UID:1\r\nDTSTART;VALUE=DATE:{_MONDAY:%Y%m%d}\r\n"
+        "SUMMARY;LANGUAGE=fr:Récupération\\, bac bleu\r\n"
+        "DESCRIPTION:Première ligne\\nDeuxième ligne\\; très long texte replié sur\r\n"
+        "  plusieurs lignes\r\nRRULE:FREQ=WEEKLY;INTERVAL=3"
+    ),
+    "until": _calendar(
+        f"UID:1\r\nDTSTART;VALUE=DATE:{_MONDAY + timedelta(days=1):%Y%m%d}\r\n"
+        "SUMMARY:Encombrants\r\n"
+        f"RRULE:FREQ=WEEKLY;INTERVAL=4;BYDAY=TU;UNTIL={_MONDAY + timedelta(weeks=30):%Y%m%d}\r\n"
+        "X-APPLE-TRAVEL:1"
+    ),
+}
+
+# Cas renvoyés aux bibliothèques
+FALLBACK_CASES = {
+    "tzid": _calendar(
+        "UID:1\r\nDTSTART;TZID=America/Toronto:20250106T070000\r\nSUMMARY:Déchets\r\n"
+        "RRULE:FREQ=WEEKLY"
+    ),
+    "monthly": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20250106\r\nSUMMARY:Déchets\r\nRRULE:FREQ=MONTHLY;BYDAY=1MO"
+    ),
+    "recurrence-id": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20250106\r\nSUMMARY:Déchets\r\nRRULE:FREQ=WEEKLY",
+        "UID:1\r\nRECURRENCE-ID;VALUE=DATE:20250113\r\nDTSTART;VALUE=DATE:20250114\r\nSUMMARY:Déchets",
+    ),
+    "rdate": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20250106\r\nSUMMARY:Déchets\r\nRDATE;VALUE=DATE:20250120"
+    ),
+}
+
+
+def _rows(schedule: Schedule) -> list[tuple]:
+    """Retourner les occurrences d'un calendrier sous une forme comparable."""
+    types = {
+        index: collecte_type
+        for collecte_type, indices in schedule.by_type.items()
+        for index in indices
+    }
+    return [
+        (event.date, event.summary, event.description, types.get(index))
+        for index, event in enumerate(schedule.events())
+    ]
+
+
+def validate() -> list[tuple[str, bytes]]:
+    """Comparer les deux chemins et retourner les calendriers mesurés."""
+    feeds = [
+        (f"{profile}/{sector}/v{version}", build_ics(sector, profile, version))
+        for profile in PROFILES
+        for sector in range(0, 30, 7)
+        for version in (0, 1)
+    ]
+    feeds += list(EDGE_CASES.items())
+
+    for name, content in feeds:
+        fast = EventExpansion(content)
+        assert fast.scanned, f"{name}: lecteur rapide non utilisé"
+        expected = _rows(EventExpansion(content, use_scanner=False).slide())
+        actual = _rows(fast.slide())
+        assert actual == expected, f"{name}: occurrences différentes"
+    print(f"{len(feeds)} calendriers identiques par les deux chemins")
+
+    for name, content in FALLBACK_CASES.items():
+        assert not EventExpansion(content).scanned, f"{name}: aurait dû être refusé"
+    print(f"{len(FALLBACK_CASES)} calendriers non pris en charge renvoyés aux bibliothèques")
+
+    return [(profile, build_ics(3, profile)) for profile in PROFILES]
+
+
+def measure(content: bytes, use_scanner: bool) -> float:
+    """Retourner la durée moyenne de lecture et d'expansion, en ms."""
+    start = perf_counter()
+    for _ in range(REPEAT):
+        EventExpansion(content, use_scanner).slide()
+    return (perf_counter() - start) / REPEAT * 1000
+
+
+def main() -> None:
+    """Valider puis mesurer."""
+    feeds = validate()
+    print(f"{'profil':>7} {'octets':>7} {'bibliothèques ms':>17} {'lecteur ms':>11} {'gain':>7}")
+    for profile, content in feeds:
+        library = measure(content, use_scanner=False)
+        scanner = measure(content, use_scanner=True)
+        print(f"{profile:>7} {len(content):>7} {library:>17.1f} {scanner:>11.2f} {library / scanner:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Calendriers ICS synthétiques pour les benchmarks.
+
+Les profils imitent le flux de la ville (événements d'une journée, règles
+hebdomadaires) à des tailles et complexités croissantes : intervalles,
+plusieurs jours par semaine, ``UNTIL``, ``EXDATE`` et événements uniques.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+COLLECTE_SUMMARIES = (
+    "Collecte des Déchets",
+    "Récupération",
+    "Compost",
+    "Encombrants",
+    "Résidus verts",
+    "Arbre de Noël",
+)
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR")
+
+# Nombre de règles récurrentes, d'événements uniques et de dates exclues par règle
+PROFILES: dict[str, dict[str, int]] = {
+    "simple": {"recurring": 3, "single": 1, "exdates": 0},
+    "medium": {"recurring": 15, "single": 30, "exdates": 3},
+    "large": {"recurring": 60, "single": 300, "exdates": 8},
+}
+
+
+def build_ics(sector: int, profile: str = "simple", version: int = 0) -> bytes:
+    """Construire le calendrier d'un secteur.
+
+    ``version`` change les descriptions, pour simuler une mise à jour du
+    fichier par la ville sans changer les dates.
+    """
+    settings = PROFILES[profile]
+    start = date(date.today().year, 1, 1)
+    # Premier lundi de l'année
+    start += timedelta(days=-start.weekday() % 7)
+    until = date(start.year + 1, 12, 31)
+
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//rn_collectes//benchmarks//FR"]
+
+    for rule in range(settings["recurring"]):
+        summary = COLLECTE_SUMMARIES[rule % len(COLLECTE_SUMMARIES)]
+        weekday = (rule + sector) % len(WEEKDAYS)
+        interval = 1 + rule % 2
+        dtstart = start + timedelta(days=weekday + 7 * (rule % 3))
+        rrule = f"FREQ=WEEKLY;INTERVAL={interval};BYDAY={WEEKDAYS[weekday]}"
+        if rule % 4 == 3:
+            # Deux jours par semaine
+            rrule += f",{WEEKDAYS[(weekday + 3) % len(WEEKDAYS)]}"
+        if rule % 3 == 2:
+            rrule += f";UNTIL={until:%Y%m%d}"
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{sector}-rule-{rule}@rn_collectes",
+            f"DTSTART;VALUE=DATE:{dtstart:%Y%m%d}",
+            f"SUMMARY:{summary}",
+            f"DESCRIPTION:Secteur {sector} - {summary} (v{version})",
+            f"RRULE:{rrule}",
+        ]
+        for exdate in range(settings["exdates"]):
+            skipped = dtstart + timedelta(weeks=interval * (4 + 6 * exdate))
+            lines.append(f"EXDATE;VALUE=DATE:{skipped:%Y%m%d}")
+        lines.append("END:VEVENT")
+
+    for single in range(settings["single"]):
+        summary = COLLECTE_SUMMARIES[single % len(COLLECTE_SUMMARIES)]
+        day = start + timedelta(days=(single * 5 + sector) % 700)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{sector}-single-{single}@rn_collectes",
+            f"DTSTART;VALUE=DATE:{day:%Y%m%d}",
+            f"SUMMARY:{summary}",
+            f"DESCRIPTION:Collecte spéciale {single} (v{version})",
+            "END:VEVENT",
+        ]
+
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode()
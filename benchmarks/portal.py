@@ -0,0 +1,123 @@
+"""Serveur local qui imite le portail citoyen de Rouyn-Noranda.
+
+Reproduit les gestionnaires OctoberCMS utilisés par ``CollectesCollector``
+(``onSubmitAddressFromPicker``, ``onChangeStreet``) et sert les fichiers
+``calendrier.ics`` générés par ``fixtures.py``, avec ``ETag`` et ``304``.
+Le numéro civique détermine le secteur (``civique % sectors``).
+
+Usage autonome : python benchmarks/portal.py [port] [profil]
+"""
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+from pathlib import Path
+import socket
+import sys
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures import build_ics  # noqa: E402
+
+STREETS = [f"Rue {index}" for index in range(400)]
+
+
+def make_app(profile: str = "simple", sectors: int = 30) -> web.Application:
+    """Créer l'application du portail."""
+    state = {"version": 0}
+    calendars: dict[tuple[int, int], tuple[bytes, str]] = {}
+
+    def calendar(sector: int) -> tuple[bytes, str]:
+        key = (sector, state["version"])
+        if key not in calendars:
+            content = build_ics(sector, profile, state["version"])
+            calendars[key] = (content, f'"{hashlib.sha256(content).hexdigest()[:16]}"')
+        return calendars[key]
+
+    async def page(request: web.Request) -> web.Response:
+        options = "".join(f'<option value="{street}">{street}</option>' for street in STREETS)
+        return web.Response(
+            text=f'<html><select><option value="">--</option>{options}</select></html>',
+            content_type="text/html",
+        )
+
+    async def ajax(request: web.Request) -> web.Response:
+        handler = request.headers.get("X-OCTOBER-REQUEST-HANDLER")
+        data = await request.post()
+        if handler == "addressPicker::onChangeStreet":
+            options = "".join(
+                f'<option value="{civic}">{civic}</option>' for civic in range(1, 200, 2)
+            )
+            return web.json_response(
+                {"addressPicker::dropdown_civic": f'<option value="">Saisir un no. civique</option>{options}'}
+            )
+        sector = int(data.get("addresses_civic", "0")) % sectors
+        return web.json_response(
+            {
+                "avisComposanteCollectes0::schedule": (
+                    "<p>https://citoyen.rouyn-noranda.ca/avis/collectes/"
+                    f"calendrier.ics?secteurs={sector}</p>"
+                )
+            }
+        )
+
+    async def ics(request: web.Request) -> web.Response:
+        content, etag = calendar(int(request.query.get("secteurs", "0")))
+        if request.method == "HEAD":
+            return web.Response(headers={"ETag": etag})
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=content, headers={"ETag": etag, "Content-Type": "text/calendar"})
+
+    async def bump(request: web.Request) -> web.Response:
+        """Publier une nouvelle version de tous les calendriers."""
+        state["version"] += 1
+        calendars.clear()
+        return web.json_response(state)
+
+    app = web.Application()
+    app.router.add_get("/calendrier-de-collectes", page)
+    app.router.add_post("/calendrier-de-collectes", ajax)
+    app.router.add_route("*", "/avis/collectes/calendrier.ics", ics)
+    app.router.add_post("/_bench/version", bump)
+    return app
+
+
+def _serve(port: int, profile: str) -> None:
+    """Servir le portail (processus enfant)."""
+    web.run_app(make_app(profile), host="127.0.0.1", port=port, print=None)
+
+
+def free_port() -> int:
+    """Retourner un port TCP libre."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_portal(profile: str) -> tuple[multiprocessing.Process, str]:
+    """Démarrer le portail dans un processus séparé et retourner son URL.
+
+    Le processus séparé garde le coût du serveur hors des mesures de CPU.
+    """
+    port = free_port()
+    process = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(port, profile), daemon=True
+    )
+    process.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            process.join(0.05)
+    return process, f"http://127.0.0.1:{port}"
+
+
+if __name__ == "__main__":
+    _serve(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 8123,
+        sys.argv[2] if len(sys.argv) > 2 else "simple",
+    )
@@ -1,45 +1,145 @@
 """Intégration Rouyn-Noranda Collectes pour Home Assistant."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import DOMAIN
-from .collector import CollectesCollector
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.typing import ConfigType
+
+from .catalog import async_get_civic_catalog
+from .const import (
+    CONF_ADDRESSES,
+    CONF_PARSE_CONCURRENCY,
+    CONF_WARM_CIVIC_CATALOG,
+    CONF_WINDOW_DAYS,
+    DATA_LOOP_MONITOR,
+    DATA_PARSE_SEMAPHORE,
+    DATA_WINDOW_DAYS,
+    DEFAULT_PARSE_CONCURRENCY,
+    DEFAULT_WINDOW_DAYS,
+    DOMAIN,
+)
+from .collector import CollectesCollector, async_close_session
+from .coordinator import async_get_sector_coordinators
+from .metrics import LoopLagMonitor
+from .notifier import CollectionNotifier
+from .services import ADDRESS_SCHEMA, async_import_addresses, async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PARSE_CONCURRENCY, default=DEFAULT_PARSE_CONCURRENCY
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_WARM_CIVIC_CATALOG, default=False): cv.boolean,
+                vol.Optional(CONF_WINDOW_DAYS, default=DEFAULT_WINDOW_DAYS): vol.All(
+                    vol.Coerce(int), vol.Range(min=7)
+                ),
+                vol.Optional(CONF_ADDRESSES): vol.All(cv.ensure_list, [ADDRESS_SCHEMA]),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Configurer les ressources partagées par toutes les entrées."""
+    conf = config.get(DOMAIN, {})
+
+    # Limiter le nombre de calendriers parsés en même temps dans l'exécuteur
+    hass.data[DATA_PARSE_SEMAPHORE] = asyncio.Semaphore(
+        conf.get(CONF_PARSE_CONCURRENCY, DEFAULT_PARSE_CONCURRENCY)
+    )
+
+    # Longueur de la fenêtre d'expansion des récurrences
+    hass.data[DATA_WINDOW_DAYS] = conf.get(CONF_WINDOW_DAYS, DEFAULT_WINDOW_DAYS)
+
+    # Mesurer le temps de blocage de la boucle d'événements, tant qu'au moins
+    # une entrée est chargée
+    monitor = hass.data[DATA_LOOP_MONITOR] = LoopLagMonitor(hass)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, monitor.async_stop)
+
+    if conf.get(CONF_WARM_CIVIC_CATALOG, False):
+
+        @callback
+        def _async_warm_civic_catalog(hass: HomeAssistant) -> None:
+            """Précharger les numéros civiques des rues déjà configurées."""
+            streets = [
+                entry.data["street"] for entry in hass.config_entries.async_entries(DOMAIN)
+            ]
+            hass.async_create_background_task(
+                async_get_civic_catalog(hass).async_warm_up(streets),
+                f"{DOMAIN} civic catalog warm-up",
+            )
+
+        async_at_started(hass, _async_warm_civic_catalog)
+
+    async_setup_services(hass)
+
+    if addresses := conf.get(CONF_ADDRESSES):
+        # Importer les adresses déclarées en YAML sans retarder le démarrage
+        hass.async_create_background_task(
+            async_import_addresses(hass, addresses), f"{DOMAIN} address import"
+        )
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Configurer l'intégration depuis une entrée de configuration."""
     hass.data.setdefault(DOMAIN, {})
 
     collector = CollectesCollector(
+        hass,
         street=entry.data["street"],
         civic_number=entry.data["civic_number"]
     )
 
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=collector.async_get_collectes,
-        update_interval=timedelta(hours=12),
-    )
-
-    # Récupération initiale des données
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        ics_url = await collector.async_known_ics_url()
+    except Exception as err:
+        raise ConfigEntryNotReady(f"Résolution de l'adresse impossible: {err}") from err
 
+    # Les entrées d'un même secteur partagent un coordinateur ; une adresse
+    # inconnue du portail garde le sien
+    coordinators = async_get_sector_coordinators(hass)
+    coordinator = await coordinators.async_acquire(entry.entry_id, ics_url, collector)
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DATA_LOOP_MONITOR].async_start()
+
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinators.async_release(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            hass.data[DATA_LOOP_MONITOR].async_stop()
+        raise
+
+    # Événements de collectes à venir, selon les options de l'entrée
+    notifier = CollectionNotifier(hass, entry, coordinator)
+    notifier.async_start()
+    entry.async_on_unload(notifier.async_stop)
+
+    async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Appliquer les options modifiées sans recharger l'entrée."""
+        notifier.async_set_options(entry.options)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     return True
 
@@ -48,5 +148,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Décharger une entrée de configuration."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_get_sector_coordinators(hass).async_release(entry.entry_id)
+
+        # Arrêter la surveillance de la boucle avec la dernière entrée
+        if not hass.data[DOMAIN]:
+            hass.data[DATA_LOOP_MONITOR].async_stop()
+
+        # Fermer la session HTTP avec la dernière entrée ; une entrée en cours
+        # de configuration (rechargement simultané) peut encore l'utiliser
+        if not hass.data[DOMAIN] and not any(
+            other.state is ConfigEntryState.SETUP_IN_PROGRESS
+            for other in hass.config_entries.async_entries(DOMAIN)
+        ):
+            async_close_session(hass)
 
     return unload_ok
@@ -0,0 +1,135 @@
+"""Cache partagé des calendriers ICS par secteur."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SECTOR_CACHE, SECTOR_CACHE_TTL
+from .schedule import Schedule
+
+if TYPE_CHECKING:
+    from .parser import EventExpansion
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SectorEntry:
+    """Calendrier d'un secteur : contenu ICS brut et résultat parsé."""
+
+    # Contenu brut, absent pour une entrée restaurée depuis le disque
+    content: bytes | None
+    data: Schedule
+    fetched_at: datetime
+    # Validateurs HTTP pour les requêtes conditionnelles
+    etag: str | None = None
+    last_modified: str | None = None
+    # Empreinte du contenu et jour local du dernier parsing
+    digest: str | None = None
+    parsed_on: date | None = None
+    # Occurrences calculées, réutilisées tant que le contenu ne change pas
+    expansion: EventExpansion | None = None
+
+
+class SectorCache:
+    """Cache des calendriers partagé par toutes les entrées de configuration.
+
+    Plusieurs adresses d'un même secteur reçoivent le même fichier
+    ``calendrier.ics?secteurs=N`` : on le télécharge et on le parse une seule
+    fois, puis on le réutilise tant qu'il est frais. Les rafraîchissements
+    simultanés d'un même secteur attendent le même chargement.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: timedelta = SECTOR_CACHE_TTL) -> None:
+        """Initialiser le cache."""
+        self.hass = hass
+        self._ttl = ttl
+        self._entries: dict[str, SectorEntry] = {}
+        self._pending: dict[str, asyncio.Task[SectorEntry]] = {}
+        # Demandes servies depuis le cache, chargées, ou jointes à un chargement en cours
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, sector: str) -> SectorEntry | None:
+        """Retourner l'entrée d'un secteur, fraîche ou non."""
+        return self._entries.get(sector)
+
+    @callback
+    def async_restore(self, sector: str, entry: SectorEntry) -> None:
+        """Amorcer le cache avec une entrée restaurée depuis le disque."""
+        self._entries.setdefault(sector, entry)
+
+    @callback
+    def async_remove(self, sector: str) -> None:
+        """Oublier le calendrier d'un secteur."""
+        self._entries.pop(sector, None)
+
+    def is_fresh(self, entry: SectorEntry) -> bool:
+        """Indiquer si une entrée peut être servie sans retourner au réseau."""
+        return dt_util.utcnow() - entry.fetched_at < self._ttl
+
+    async def async_get(
+        self,
+        sector: str,
+        loader: Callable[[SectorEntry | None], Awaitable[SectorEntry]],
+    ) -> SectorEntry:
+        """Retourner le calendrier d'un secteur, en le chargeant au besoin.
+
+        ``loader`` reçoit l'entrée précédente (ou ``None``) et retourne la
+        nouvelle entrée. Un seul chargement par secteur est actif à la fois.
+        """
+        entry = self._entries.get(sector)
+        if entry is not None and self.is_fresh(entry):
+            self.hits += 1
+            return entry
+
+        if (task := self._pending.get(sector)) is None:
+            self.misses += 1
+            task = self.hass.async_create_task(self._async_load(sector, loader, entry))
+            self._pending[sector] = task
+        else:
+            self.coalesced += 1
+            _LOGGER.debug("Chargement du secteur %s déjà en cours, en attente", sector)
+
+        # Protéger le chargement partagé si l'appelant est annulé
+        return await asyncio.shield(task)
+
+    async def _async_load(
+        self,
+        sector: str,
+        loader: Callable[[SectorEntry | None], Awaitable[SectorEntry]],
+        previous: SectorEntry | None,
+    ) -> SectorEntry:
+        """Charger un secteur et mémoriser le résultat."""
+        try:
+            entry = await loader(previous)
+            self._entries[sector] = entry
+            return entry
+        finally:
+            self._pending.pop(sector, None)
+
+    def as_dict(self) -> dict[str, any]:
+        """Retourner l'état du cache."""
+        return {
+            "sectors": len(self._entries),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+@callback
+def async_get_sector_cache(hass: HomeAssistant) -> SectorCache:
+    """Retourner le cache de secteurs partagé, en le créant au besoin."""
+    if (cache := hass.data.get(DATA_SECTOR_CACHE)) is None:
+        cache = hass.data[DATA_SECTOR_CACHE] = SectorCache(hass)
+    return cache
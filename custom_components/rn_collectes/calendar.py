@@ -2,22 +2,40 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 import logging
+from weakref import WeakKeyDictionary
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
 
 from .const import DOMAIN
+from .coordinator import CollectesCoordinator
+from .entity import CollectesEntity
+from .schedule import Schedule
 
 _LOGGER = logging.getLogger(__name__)
 
+# CalendarEvent construits une fois par calendrier de secteur et partagés par
+# toutes les entités qui l'affichent
+_CALENDAR_EVENTS: WeakKeyDictionary[Schedule, list[CalendarEvent]] = WeakKeyDictionary()
+
+
+def _calendar_events(schedule: Schedule) -> list[CalendarEvent]:
+    """Retourner les événements du calendrier, construits à la première demande."""
+    if (events := _CALENDAR_EVENTS.get(schedule)) is None:
+        events = _CALENDAR_EVENTS[schedule] = [
+            CalendarEvent(
+                start=event.date,
+                end=event.date + timedelta(days=1),
+                summary=event.summary,
+                description=event.description,
+            )
+            for event in schedule.events()
+        ]
+    return events
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -30,12 +48,12 @@ async def async_setup_entry(
     async_add_entities([CollectesCalendar(coordinator, entry)])
 
 
-class CollectesCalendar(CoordinatorEntity, CalendarEntity):
+class CollectesCalendar(CollectesEntity, CalendarEntity):
     """Calendrier des collectes."""
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: CollectesCoordinator,
         entry: ConfigEntry,
     ) -> None:
         """Initialiser le calendrier."""
@@ -46,28 +64,23 @@ class CollectesCalendar(CoordinatorEntity, CalendarEntity):
         self._attr_name = f"{displayed_number} - Calendrier"
         self._attr_unique_id = f"{entry.entry_id}_calendar"
 
+    def _state_fingerprint(self) -> tuple | None:
+        """Retourner l'empreinte du prochain événement."""
+        if (event := self.event) is None:
+            return None
+        return event.start, event.summary, event.description
+
     @property
     def event(self) -> CalendarEvent | None:
         """Retourner le prochain événement."""
-        if not self.coordinator.data:
-            return None
-
-        all_events = self.coordinator.data.get('all_events', [])
-        
-        if not all_events:
+        schedule = self.coordinator.data
+        if not schedule:
             return None
 
-        # Trouver le prochain événement (utiliser le fuseau horaire de Rouyn-Noranda)
-        tz = ZoneInfo("America/Toronto")
-        now = datetime.now(tz)
-        for event_data in all_events:
-            if event_data['date'] >= now:
-                return CalendarEvent(
-                    start=event_data['date'],
-                    end=event_data['date'] + timedelta(days=1),
-                    summary=event_data['summary'],
-                    description=event_data.get('description', ''),
-                )
+        # Trouver le prochain événement à partir du jour local courant
+        position = schedule.upcoming_position(self.coordinator.today)
+        if position < len(schedule):
+            return _calendar_events(schedule)[position]
 
         return None
 
@@ -78,27 +91,13 @@ class CollectesCalendar(CoordinatorEntity, CalendarEntity):
         end_date: datetime,
     ) -> list[CalendarEvent]:
         """Retourner les événements entre deux dates."""
-        if not self.coordinator.data:
+        schedule = self.coordinator.data
+        if not schedule:
             return []
 
-        all_events = self.coordinator.data.get('all_events', [])
-        
-        events = []
-        for event_data in all_events:
-            event_date = event_data['date']
-            
-            # Vérifier si l'événement est dans la plage de dates
-            if start_date <= event_date <= end_date:
-                events.append(
-                    CalendarEvent(
-                        start=event_date,
-                        end=event_date + timedelta(days=1),
-                        summary=event_data['summary'],
-                        description=event_data.get('description', ''),
-                    )
-                )
-
-        return events
+        # Découper la plage par bisection dans les instants triés
+        window = schedule.window(start_date.timestamp(), end_date.timestamp())
+        return _calendar_events(schedule)[window.start:window.stop]
 
     @property
     def device_info(self):
@@ -0,0 +1,186 @@
+"""Catalogues d'adresses partagés par les flux de configuration."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import datetime
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .collector import CollectesCollector
+from .const import (
+    CIVIC_CATALOG_SIZE,
+    CIVIC_CATALOG_TTL,
+    CIVIC_STORAGE_KEY,
+    DATA_CIVIC_CATALOG,
+    DATA_STREET_CATALOG,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    STREET_CATALOG_TTL,
+    STREET_STORAGE_KEY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StreetCatalog:
+    """Liste des rues de Rouyn-Noranda, conservée sur disque.
+
+    Chaque nouveau flux de configuration réutilise la liste tant qu'elle a
+    moins de ``STREET_CATALOG_TTL`` ; les flux ouverts en même temps
+    attendent le même téléchargement.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialiser le catalogue."""
+        self.hass = hass
+        self._store: Store[dict[str, any]] = Store(
+            hass, STORAGE_VERSION, STREET_STORAGE_KEY
+        )
+        self._streets: list[str] | None = None
+        self._fetched_at = None
+        self._lock = asyncio.Lock()
+
+    async def async_get_streets(self) -> list[str]:
+        """Retourner la liste des rues, téléchargée au besoin."""
+        async with self._lock:
+            if self._streets is None:
+                data = await self._store.async_load() or {}
+                self._streets = data.get("streets", [])
+                self._fetched_at = dt_util.parse_datetime(data.get("fetched_at", ""))
+
+            if self._streets and self._fetched_at is not None and (
+                dt_util.utcnow() - self._fetched_at < STREET_CATALOG_TTL
+            ):
+                return self._streets
+
+            streets = await CollectesCollector.async_get_streets(self.hass)
+            if not streets:
+                # Site indisponible : une liste périmée vaut mieux que rien
+                return self._streets
+
+            self._streets = streets
+            self._fetched_at = dt_util.utcnow()
+            await self._store.async_save(
+                {"streets": streets, "fetched_at": self._fetched_at.isoformat()}
+            )
+            return streets
+
+
+@callback
+def async_get_street_catalog(hass: HomeAssistant) -> StreetCatalog:
+    """Retourner le catalogue des rues partagé."""
+    if (catalog := hass.data.get(DATA_STREET_CATALOG)) is None:
+        catalog = hass.data[DATA_STREET_CATALOG] = StreetCatalog(hass)
+    return catalog
+
+
+class CivicCatalog:
+    """Numéros civiques des rues consultées, dans un cache LRU borné.
+
+    L'intégration d'un immeuble ajoute souvent plusieurs logements de la même
+    rue : la correspondance {numéro affiché: valeur du formulaire} n'est
+    demandée qu'une fois au portail, puis partagée par tous les flux et
+    conservée sur disque pendant ``CIVIC_CATALOG_TTL``.
+    """
+
+    def __init__(self, hass: HomeAssistant, maxsize: int = CIVIC_CATALOG_SIZE) -> None:
+        """Initialiser le catalogue."""
+        self.hass = hass
+        self._maxsize = maxsize
+        self._store: Store[dict[str, any]] = Store(
+            hass, STORAGE_VERSION, CIVIC_STORAGE_KEY
+        )
+        # Rue -> (numéros civiques, date de téléchargement), du plus ancien
+        # au plus récemment utilisé
+        self._streets: OrderedDict[str, tuple[dict[str, str], datetime]] | None = None
+        self._pending: dict[str, asyncio.Task[dict[str, str]]] = {}
+        self._load_lock = asyncio.Lock()
+
+    async def _async_load(self) -> None:
+        """Charger le catalogue depuis le disque (une seule fois)."""
+        async with self._load_lock:
+            if self._streets is not None:
+                return
+            data = await self._store.async_load() or {}
+            self._streets = OrderedDict()
+            for street, record in data.get("streets", {}).items():
+                if (fetched_at := dt_util.parse_datetime(record.get("fetched_at", ""))) is not None:
+                    self._streets[street] = (record["civic_numbers"], fetched_at)
+
+    def _get_fresh(self, street: str) -> dict[str, str] | None:
+        """Retourner les numéros d'une rue s'ils sont encore frais."""
+        if (cached := self._streets.get(street)) is None:
+            return None
+        civic_numbers, fetched_at = cached
+        if dt_util.utcnow() - fetched_at >= CIVIC_CATALOG_TTL:
+            return None
+        self._streets.move_to_end(street)
+        return civic_numbers
+
+    async def async_get_civic_numbers(self, street: str) -> dict[str, str]:
+        """Retourner les numéros civiques d'une rue, téléchargés au besoin."""
+        await self._async_load()
+        if (civic_numbers := self._get_fresh(street)) is not None:
+            return civic_numbers
+
+        # Un seul téléchargement par rue, même pour plusieurs flux simultanés
+        if (task := self._pending.get(street)) is None:
+            task = self.hass.async_create_task(self._async_fetch(street))
+            self._pending[street] = task
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, street: str) -> dict[str, str]:
+        """Télécharger les numéros civiques d'une rue et les mémoriser."""
+        try:
+            civic_numbers = await CollectesCollector.async_get_civic_numbers(
+                self.hass, street
+            )
+        finally:
+            self._pending.pop(street, None)
+
+        if not civic_numbers:
+            # Site indisponible : garder les numéros périmés s'il y en a
+            if (cached := self._streets.get(street)) is not None:
+                return cached[0]
+            return civic_numbers
+
+        self._streets[street] = (civic_numbers, dt_util.utcnow())
+        self._streets.move_to_end(street)
+        while len(self._streets) > self._maxsize:
+            self._streets.popitem(last=False)
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        return civic_numbers
+
+    async def async_warm_up(self, streets: Iterable[str]) -> None:
+        """Précharger les numéros civiques de rues déjà configurées."""
+        await self._async_load()
+        for street in dict.fromkeys(streets):
+            if self._get_fresh(street) is None:
+                _LOGGER.debug("Préchargement des numéros civiques de %s", street)
+                await self.async_get_civic_numbers(street)
+
+    @callback
+    def _data_to_save(self) -> dict[str, any]:
+        """Retourner les données à écrire sur le disque."""
+        return {
+            "streets": {
+                street: {
+                    "civic_numbers": civic_numbers,
+                    "fetched_at": fetched_at.isoformat(),
+                }
+                for street, (civic_numbers, fetched_at) in self._streets.items()
+            }
+        }
+
+
+@callback
+def async_get_civic_catalog(hass: HomeAssistant) -> CivicCatalog:
+    """Retourner le catalogue des numéros civiques partagé."""
+    if (catalog := hass.data.get(DATA_CIVIC_CATALOG)) is None:
+        catalog = hass.data[DATA_CIVIC_CATALOG] = CivicCatalog(hass)
+    return catalog
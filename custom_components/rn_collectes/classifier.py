@@ -0,0 +1,94 @@
+"""Classification des résumés d'événements par type de collecte."""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+import logging
+import re
+import threading
+import unicodedata
+
+_LOGGER = logging.getLogger(__name__)
+
+# Nombre maximal de résumés distincts mémorisés
+MAX_MEMOIZED_SUMMARIES = 1024
+# Nombre maximal de résumés sans type comptés
+MAX_UNMATCHED_SUMMARIES = 100
+
+
+def normalize(text: str) -> str:
+    """Retirer les accents et la casse (« Déchets » → « dechets »)."""
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    ).casefold()
+
+
+class SummaryClassifier:
+    """Associer un résumé d'événement à un type de collecte.
+
+    Les types sont compilés une fois en une seule expression régulière sur
+    le texte sans accents ni casse, et le résultat est mémorisé par résumé
+    distinct : le coût est proportionnel au nombre de résumés différents,
+    pas au nombre d'occurrences. Quand plusieurs types apparaissent dans un
+    résumé, le premier dans l'ordre de ``collecte_types`` l'emporte.
+
+    Une instance est partagée par les parsings qui s'exécutent en parallèle
+    dans l'exécuteur : les écritures passent par un verrou, la lecture d'un
+    résultat déjà mémorisé n'en a pas besoin.
+    """
+
+    def __init__(self, collecte_types: Iterable[str]) -> None:
+        """Compiler l'expression des types de collecte."""
+        self._types = {normalize(collecte_type): collecte_type for collecte_type in collecte_types}
+        self._priority = {key: index for index, key in enumerate(self._types)}
+        self._pattern = re.compile(
+            "|".join(re.escape(key) for key in sorted(self._types, key=len, reverse=True))
+        )
+        self._memo: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        # Occurrences classées sans type, par résumé, depuis le démarrage ;
+        # au-delà de MAX_UNMATCHED_SUMMARIES résumés, les nouveaux ne sont
+        # plus que comptés dans unmatched_dropped
+        self.unmatched: Counter[str] = Counter()
+        self.unmatched_dropped = 0
+
+    def classify(self, summary: str) -> str | None:
+        """Retourner le type de collecte d'un résumé, ou ``None``."""
+        try:
+            collecte_type = self._memo[summary]
+        except KeyError:
+            collecte_type = self._classify(summary)
+            with self._lock:
+                if len(self._memo) >= MAX_MEMOIZED_SUMMARIES:
+                    self._memo.clear()
+                self._memo[summary] = collecte_type
+
+        if collecte_type is None:
+            self._count_unmatched(summary)
+        return collecte_type
+
+    def unmatched_as_dict(self) -> dict[str, any]:
+        """Retourner les résumés sans type et leurs occurrences."""
+        with self._lock:
+            return {"summaries": dict(self.unmatched), "dropped": self.unmatched_dropped}
+
+    def _count_unmatched(self, summary: str) -> None:
+        """Compter une occurrence sans type, avertir à la première."""
+        with self._lock:
+            if summary in self.unmatched:
+                self.unmatched[summary] += 1
+                return
+            if len(self.unmatched) >= MAX_UNMATCHED_SUMMARIES:
+                self.unmatched_dropped += 1
+                return
+            self.unmatched[summary] = 1
+        _LOGGER.warning("Type de collecte inconnu pour l'événement « %s »", summary)
+
+    def _classify(self, summary: str) -> str | None:
+        """Chercher le type de collecte prioritaire dans le résumé."""
+        matches = self._pattern.findall(normalize(summary))
+        if not matches:
+            return None
+        return self._types[min(matches, key=self._priority.__getitem__)]
@@ -1,225 +1,532 @@
 """Collecteur de données pour Rouyn-Noranda."""
 from __future__ import annotations
 
+import asyncio
+import codecs
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 import logging
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from datetime import datetime
+from functools import partial
+import hashlib
 import re
 import aiohttp
-from icalendar import Calendar
-import recurring_ical_events
+from aiohttp import hdrs
 
-from .const import BASE_URL, COLLECTE_TYPES
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import dt as dt_util
+
+from .cache import SectorEntry, async_get_sector_cache
+from .const import (
+    BASE_URL,
+    DATA_PARSE_SEMAPHORE,
+    DATA_REQUEST_SEMAPHORE,
+    DATA_SESSION,
+    DATA_WINDOW_DAYS,
+    DEFAULT_PARSE_CONCURRENCY,
+    DEFAULT_WINDOW_DAYS,
+    MAX_CONCURRENT_REQUESTS,
+    REQUEST_TIMEOUT,
+    STREAM_CHUNK_SIZE,
+    TIMEZONE,
+)
+from .metrics import async_get_collector_stats
+from .parser import EventExpansion, expand_ics
+from .ratelimit import async_get_token_bucket
+from .schedule import Schedule
+from .store import AddressStore, async_get_address_store, async_get_schedule_store
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def sector_from_url(ics_url: str) -> str:
+    """Extraire l'identifiant de secteur d'une URL de calendrier."""
+    if match := re.search(r'secteurs=(\d+)', ics_url):
+        return match.group(1)
+    # URL inattendue : la clé reste unique par calendrier
+    return ics_url
+
+
+# Pattern pour trouver les options du select des rues
+_STREET_OPTION = re.compile(r'<option[^>]*value="([^"]+)"[^>]*>([^<]+)</option>')
+
+
+def _collect_streets(html: str, streets: set[str]) -> str:
+    """Ajouter les rues des options complètes de ``html`` à ``streets``.
+
+    Retourne la fin du texte qui peut contenir une option incomplète, à
+    compléter avec le prochain morceau reçu.
+    """
+    last_end = 0
+    for match in _STREET_OPTION.finditer(html):
+        value, text = match.groups()
+        # Filtrer les options vides et garder seulement les rues
+        if value.strip() and not value.startswith('--'):
+            streets.add(text.strip())
+        last_end = match.end()
+
+    start = html.rfind('<option', last_end)
+    if start == -1:
+        # Garder assez de texte pour une balise coupée en deux
+        start = max(last_end, len(html) - len('<option'))
+    return html[start:]
+
+
+@callback
+def async_get_parse_semaphore(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Retourner le sémaphore qui limite les parsings simultanés."""
+    if (semaphore := hass.data.get(DATA_PARSE_SEMAPHORE)) is None:
+        semaphore = hass.data[DATA_PARSE_SEMAPHORE] = asyncio.Semaphore(
+            DEFAULT_PARSE_CONCURRENCY
+        )
+    return semaphore
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Retourner la session HTTP partagée par toutes les entrées.
+
+    La session réutilise le connecteur de Home Assistant (keep-alive, cache
+    DNS) avec un délai d'expiration explicite.
+    """
+    session = hass.data.get(DATA_SESSION)
+    if session is None or session.closed:
+        # Pas de nettoyage automatique : il détacherait la session au
+        # déchargement de l'entrée qui l'a créée, alors qu'elle est partagée
+        session = hass.data[DATA_SESSION] = async_create_clientsession(
+            hass,
+            auto_cleanup=False,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+    return session
+
+
+@callback
+def async_close_session(hass: HomeAssistant) -> None:
+    """Détacher la session HTTP partagée du connecteur de Home Assistant."""
+    if (session := hass.data.pop(DATA_SESSION, None)) is not None:
+        session.detach()
+
+
+@asynccontextmanager
+async def async_request(
+    hass: HomeAssistant, method: str, url: str, **kwargs: any
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """Envoyer une requête au portail avec la session partagée.
+
+    Le débit (seau à jetons) et le nombre de requêtes simultanées sont
+    bornés pour toutes les entrées.
+    """
+    if (semaphore := hass.data.get(DATA_REQUEST_SEMAPHORE)) is None:
+        semaphore = hass.data[DATA_REQUEST_SEMAPHORE] = asyncio.Semaphore(
+            MAX_CONCURRENT_REQUESTS
+        )
+    await async_get_token_bucket(hass).async_acquire()
+    async with semaphore, async_get_session(hass).request(method, url, **kwargs) as response:
+        yield response
+
+
+class IcsNotFound(Exception):
+    """Le fichier .ics d'un secteur n'existe plus (404)."""
+
+
 class CollectesCollector:
     """Classe pour récupérer les données de collecte."""
 
-    def __init__(self, street: str = None, civic_number: str = None) -> None:
+    def __init__(
+        self, hass: HomeAssistant, street: str = None, civic_number: str = None
+    ) -> None:
         """Initialiser le collecteur."""
+        self.hass = hass
         self.street = street
         self.civic_number = civic_number
-        self._session = None
+        self._stats = async_get_collector_stats(hass)
 
     @staticmethod
-    async def async_get_streets() -> list[str]:
-        """Récupérer la liste des rues disponibles."""
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(f"{BASE_URL}/calendrier-de-collectes") as response:
-                    html = await response.text()
-                    
-                    # Chercher les options de rue dans le HTML
-                    # Pattern pour trouver les options du select
-                    pattern = r'<option[^>]*value="([^"]+)"[^>]*>([^<]+)</option>'
-                    matches = re.findall(pattern, html)
-                    
-                    streets = []
-                    for value, text in matches:
-                        # Filtrer les options vides et garder seulement les rues
-                        if value and value.strip() and not value.startswith('--'):
-                            streets.append(text.strip())
-                    
-                    # Si on ne trouve pas d'options, retourner une liste vide
-                    if not streets:
-                        _LOGGER.warning("Aucune rue trouvée dans le HTML")
-                    
-                    return sorted(set(streets))  # Retirer les doublons et trier
-                    
-            except Exception as err:
-                _LOGGER.error("Erreur lors de la récupération des rues: %s", err)
-                return []
+    async def async_get_streets(hass: HomeAssistant) -> list[str]:
+        """Récupérer la liste des rues disponibles.
+
+        La page est analysée au fil de la réception, sans attendre ni garder
+        tout le HTML en mémoire.
+        """
+        try:
+            streets: set[str] = set()
+            async with async_request(
+                hass, hdrs.METH_GET, f"{BASE_URL}/calendrier-de-collectes"
+            ) as response:
+                decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                    errors="replace"
+                )
+                pending = ""
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    pending = _collect_streets(pending + decoder.decode(chunk), streets)
+                _collect_streets(pending + decoder.decode(b"", final=True), streets)
+
+            # Si on ne trouve pas d'options, retourner une liste vide
+            if not streets:
+                _LOGGER.warning("Aucune rue trouvée dans le HTML")
+
+            return sorted(streets)  # Trier (les doublons sont déjà retirés)
+
+        except Exception as err:
+            _LOGGER.error("Erreur lors de la récupération des rues: %s", err)
+            return []
 
     @staticmethod
-    async def async_get_civic_numbers(street: str) -> dict[str, str]:
+    async def async_get_civic_numbers(hass: HomeAssistant, street: str) -> dict[str, str]:
         """Récupérer la liste des numéros civiques pour une rue donnée.
-        
+
         Retourne un dictionnaire {numéro_affiché: value_formulaire}
         """
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Appeler l'API AJAX d'OctoberCMS pour obtenir les numéros civiques
-                headers = {
-                    'X-Requested-With': 'XMLHttpRequest',
-                    'X-OCTOBER-REQUEST-HANDLER': 'addressPicker::onChangeStreet',
-                    'X-OCTOBER-REQUEST-PARTIALS': 'addressPicker::dropdown_civic',
-                }
-                
-                data = {
-                    'addresses_street': street,
-                }
-                
-                async with session.post(
-                    f"{BASE_URL}/calendrier-de-collectes",
-                    headers=headers,
-                    data=data
-                ) as response:
-                    result = await response.json()
-                    
-                    # Extraire les numéros civiques du HTML retourné
-                    html_content = result.get('addressPicker::dropdown_civic', '')
-                    
-                    # Parser le HTML pour extraire value et texte
-                    pattern = r'<option value="([^"]*)"\s*>([^<]+)</option>'
-                    matches = re.findall(pattern, html_content)
-                    
-                    # Créer un dictionnaire {numéro_affiché: value}
-                    civic_numbers = {}
-                    for value, text in matches:
-                        text = text.strip()
-                        if text and text != "Saisir un no. civique" and value:
-                            civic_numbers[text] = value
-                    
-                    return civic_numbers
-                
-            except Exception as err:
-                _LOGGER.error("Erreur lors de la récupération des numéros civiques: %s", err)
-                return {}
-
-    async def async_get_collectes(self) -> dict[str, any]:
-        """Récupérer les données de collecte."""
         try:
-            # Créer la session si elle n'existe pas
-            if self._session is None:
-                self._session = aiohttp.ClientSession()
-
-            # Soumettre le formulaire en AJAX pour obtenir le calendrier
+            # Appeler l'API AJAX d'OctoberCMS pour obtenir les numéros civiques
             headers = {
                 'X-Requested-With': 'XMLHttpRequest',
-                'X-OCTOBER-REQUEST-HANDLER': 'avisComposanteCollectes0::onSubmitAddressFromPicker',
-                'X-OCTOBER-REQUEST-PARTIALS': 'avisComposanteCollectes0::schedule',
+                'X-OCTOBER-REQUEST-HANDLER': 'addressPicker::onChangeStreet',
+                'X-OCTOBER-REQUEST-PARTIALS': 'addressPicker::dropdown_civic',
             }
-            
-            form_data = {
-                "addresses_street": self.street,
-                "addresses_civic": self.civic_number,
+
+            data = {
+                'addresses_street': street,
             }
 
-            async with self._session.post(
+            async with async_request(
+                hass,
+                hdrs.METH_POST,
                 f"{BASE_URL}/calendrier-de-collectes",
                 headers=headers,
-                data=form_data,
-                allow_redirects=True
+                data=data
             ) as response:
                 result = await response.json()
-                
-                # Extraire le HTML du calendrier
-                html_content = result.get('avisComposanteCollectes0::schedule', '')
-                if not html_content:
-                    html_content = result.get('#schedule', '')
-                
-                if not html_content:
-                    _LOGGER.error("Aucune donnée de calendrier retournée")
-                    return {}
-                
-                # Extraire l'URL du fichier .ics
-                ics_match = re.search(r'href="(webcal://[^"]+\.ics[^"]*)"', html_content)
-                if not ics_match:
-                    ics_match = re.search(r'https://citoyen\.rouyn-noranda\.ca/avis/collectes/calendrier\.ics\?secteurs=(\d+)', html_content)
-                    if ics_match:
-                        secteur = ics_match.group(1)
-                        ics_url = f"{BASE_URL}/avis/collectes/calendrier.ics?secteurs={secteur}"
-                    else:
-                        _LOGGER.error("Impossible de trouver le lien .ics dans la réponse")
-                        return {}
-                else:
-                    ics_url = ics_match.group(1).replace('webcal://', 'https://')
-                
-                # Télécharger le fichier .ics
-                async with self._session.get(ics_url) as ics_response:
-                    ics_content = await ics_response.read()
 
-            # Parser le fichier .ics
-            return await self._parse_ics(ics_content)
+            # Extraire les numéros civiques du HTML retourné
+            html_content = result.get('addressPicker::dropdown_civic', '')
+
+            # Parser le HTML pour extraire value et texte
+            pattern = r'<option value="([^"]*)"\s*>([^<]+)</option>'
+            matches = re.findall(pattern, html_content)
+
+            # Créer un dictionnaire {numéro_affiché: value}
+            civic_numbers = {}
+            for value, text in matches:
+                text = text.strip()
+                if text and text != "Saisir un no. civique" and value:
+                    civic_numbers[text] = value
+
+            return civic_numbers
+
+        except Exception as err:
+            _LOGGER.error("Erreur lors de la récupération des numéros civiques: %s", err)
+            return {}
+
+    async def async_get_collectes(self) -> Schedule | None:
+        """Récupérer les données de collecte."""
+        try:
+            store = await async_get_address_store(self.hass)
+            ics_url = await self._async_resolve(store)
+            if ics_url is None:
+                return None
+
+            try:
+                entry = await self._async_get_sector(ics_url)
+            except IcsNotFound:
+                # L'adresse a changé de secteur : résoudre à nouveau
+                _LOGGER.info(
+                    "Calendrier introuvable pour %s %s, nouvelle résolution de l'adresse",
+                    self.civic_number,
+                    self.street,
+                )
+                store.async_remove(self.street, self.civic_number)
+                ics_url = await self._async_resolve(store)
+                if ics_url is None:
+                    return None
+                entry = await self._async_get_sector(ics_url)
+
+            return entry.data
 
         except Exception as err:
             _LOGGER.error("Erreur lors de la récupération des données: %s", err)
             raise
 
-    async def _parse_ics(self, ics_content: bytes) -> dict[str, any]:
-        """Parser le contenu ICS."""
+    async def async_validate(self) -> bool:
+        """Vérifier que l'adresse mène à un calendrier, sans le télécharger.
+
+        L'adresse est résolue (et mémorisée pour l'entrée qui sera créée)
+        puis l'URL du calendrier est vérifiée par une requête ``HEAD``.
+        """
+        store = await async_get_address_store(self.hass)
+        if (ics_url := await self._async_resolve(store)) is None:
+            return False
+
+        # Calendrier déjà en cache pour ce secteur : rien à vérifier
+        cache = async_get_sector_cache(self.hass)
+        if (entry := cache.get(sector_from_url(ics_url))) is not None and cache.is_fresh(entry):
+            return True
+
+        if await self._async_check_ics_url(ics_url):
+            return True
+
+        # L'adresse a changé de secteur : résoudre à nouveau
+        store.async_remove(self.street, self.civic_number)
+        if (ics_url := await self._async_resolve(store)) is None:
+            return False
+        return await self._async_check_ics_url(ics_url)
+
+    async def async_resolve_ics_url(self) -> str | None:
+        """Retourner l'URL du calendrier de l'adresse, revérifiée si elle est ancienne."""
+        return await self._async_resolve(await async_get_address_store(self.hass))
+
+    async def async_resolve_sector(self) -> str | None:
+        """Résoudre l'adresse en secteur, sans télécharger le calendrier."""
+        if (ics_url := await self.async_resolve_ics_url()) is None:
+            return None
+        return sector_from_url(ics_url)
+
+    async def async_known_ics_url(self) -> str | None:
+        """Retourner l'URL mémorisée du calendrier, ou la résoudre si elle est inconnue.
+
+        Contrairement à ``async_resolve_ics_url``, un enregistrement à
+        revérifier est utilisé tel quel : le démarrage n'attend pas le portail.
+        """
+        record = (await async_get_address_store(self.hass)).get(
+            self.street, self.civic_number
+        )
+        if record is not None:
+            return record["ics_url"]
+        return await self.async_resolve_ics_url()
+
+    async def async_get_sector_collectes(self, ics_url: str) -> Schedule:
+        """Récupérer le calendrier d'un secteur par son URL, sans passer par une adresse.
+
+        Lève ``IcsNotFound`` si le calendrier n'existe plus.
+        """
+        return (await self._async_get_sector(ics_url)).data
+
+    async def async_forget_sector(self, ics_url: str) -> None:
+        """Oublier un calendrier disparu et les adresses qui y menaient.
+
+        Les adresses seront résolues à nouveau auprès du portail, et aucun
+        calendrier périmé ne sera restauré pour ce secteur.
+        """
+        sector = sector_from_url(ics_url)
+        async_get_sector_cache(self.hass).async_remove(sector)
+        (await async_get_schedule_store(self.hass)).async_remove(sector)
+        (await async_get_address_store(self.hass)).async_remove_url(ics_url)
+
+    async def async_restore_sector(self, ics_url: str) -> Schedule | None:
+        """Retourner le dernier calendrier connu d'un secteur, sans accès réseau."""
+        sector = sector_from_url(ics_url)
+        cache = async_get_sector_cache(self.hass)
+        if (entry := cache.get(sector)) is None:
+            if (entry := (await async_get_schedule_store(self.hass)).get(sector)) is None:
+                return None
+            # Le prochain rafraîchissement partira de cette entrée
+            cache.async_restore(sector, entry)
+
+        return entry.data
+
+    async def _async_resolve(self, store: AddressStore) -> str | None:
+        """Retourner l'URL du calendrier, résolue auprès du portail au besoin."""
+        record = store.get(self.street, self.civic_number)
+        if record is not None and not store.is_stale(record):
+            self._stats.counters["address_hits"] += 1
+            return record["ics_url"]
+
+        self._stats.counters["address_misses"] += 1
         try:
-            calendar = Calendar.from_ical(ics_content)
-            
-            # Utiliser le fuseau horaire de Rouyn-Noranda (America/Toronto)
-            tz = ZoneInfo("America/Toronto")
-            
-            # Obtenir les événements des 365 prochains jours
-            start_date = datetime.now(tz).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = start_date + timedelta(days=365)
-            
-            events = recurring_ical_events.of(calendar).between(start_date, end_date)
-            
-            # Organiser les événements par type de collecte
-            collectes = {collecte_type: [] for collecte_type in COLLECTE_TYPES}
-            all_events = []
-            
-            for event in events:
-                summary = str(event.get('SUMMARY', ''))
-                dtstart = event.get('DTSTART').dt
-                
-                # Convertir en datetime avec le fuseau horaire approprié
-                if isinstance(dtstart, datetime):
-                    event_date = dtstart
-                    if event_date.tzinfo is None:
-                        event_date = event_date.replace(tzinfo=tz)
-                else:
-                    # Si c'est une date (sans heure), créer un datetime à minuit dans le fuseau horaire local
-                    event_date = datetime.combine(dtstart, datetime.min.time()).replace(tzinfo=tz)
-                
-                event_data = {
-                    'date': event_date,
-                    'summary': summary,
-                    'description': str(event.get('DESCRIPTION', '')),
-                }
-                
-                all_events.append(event_data)
-                
-                # Associer l'événement à un type de collecte
-                for collecte_type in COLLECTE_TYPES:
-                    if collecte_type.lower() in summary.lower():
-                        collectes[collecte_type].append(event_data)
-                        break
-            
-            # Trier les événements par date
-            for collecte_type in collectes:
-                collectes[collecte_type].sort(key=lambda x: x['date'])
-            
-            all_events.sort(key=lambda x: x['date'])
-            
-            return {
-                'collectes': collectes,
-                'all_events': all_events,
-                'last_update': datetime.now()
-            }
-            
+            with self._stats.measure("resolve"):
+                ics_url = await self._async_get_ics_url()
         except Exception as err:
-            _LOGGER.error("Erreur lors du parsing ICS: %s", err)
-            raise
+            if record is None:
+                raise
+            # Revérification périodique en échec : garder l'URL connue
+            _LOGGER.debug("Revérification de l'adresse impossible: %s", err)
+            return record["ics_url"]
+
+        if ics_url is not None:
+            store.async_set(self.street, self.civic_number, ics_url)
+        return ics_url
+
+    async def _async_get_sector(self, ics_url: str) -> SectorEntry:
+        """Obtenir le calendrier du secteur depuis le cache partagé."""
+        # Le calendrier est partagé par toutes les adresses du secteur
+        return await async_get_sector_cache(self.hass).async_get(
+            sector_from_url(ics_url),
+            partial(self._async_fetch_sector, ics_url),
+        )
+
+    async def _async_check_ics_url(self, ics_url: str) -> bool:
+        """Vérifier par une requête ``HEAD`` que le calendrier existe."""
+        async with async_request(
+            self.hass, hdrs.METH_HEAD, ics_url, allow_redirects=True
+        ) as response:
+            if response.status == 404:
+                return False
+            if response.status in (405, 501):
+                # HEAD non supporté : la première récupération tranchera
+                return True
+            response.raise_for_status()
+            return True
+
+    async def _async_get_ics_url(self) -> str | None:
+        """Soumettre l'adresse au portail et extraire l'URL du fichier .ics."""
+        # Soumettre le formulaire en AJAX pour obtenir le calendrier
+        headers = {
+            'X-Requested-With': 'XMLHttpRequest',
+            'X-OCTOBER-REQUEST-HANDLER': 'avisComposanteCollectes0::onSubmitAddressFromPicker',
+            'X-OCTOBER-REQUEST-PARTIALS': 'avisComposanteCollectes0::schedule',
+        }
+
+        form_data = {
+            "addresses_street": self.street,
+            "addresses_civic": self.civic_number,
+        }
+
+        async with async_request(
+            self.hass,
+            hdrs.METH_POST,
+            f"{BASE_URL}/calendrier-de-collectes",
+            headers=headers,
+            data=form_data,
+            allow_redirects=True
+        ) as response:
+            result = await response.json()
+
+        # Extraire le HTML du calendrier
+        html_content = result.get('avisComposanteCollectes0::schedule', '')
+        if not html_content:
+            html_content = result.get('#schedule', '')
+
+        if not html_content:
+            _LOGGER.error("Aucune donnée de calendrier retournée")
+            return None
+
+        # Extraire l'URL du fichier .ics
+        ics_match = re.search(r'href="(webcal://[^"]+\.ics[^"]*)"', html_content)
+        if ics_match:
+            return ics_match.group(1).replace('webcal://', 'https://')
+
+        ics_match = re.search(r'https://citoyen\.rouyn-noranda\.ca/avis/collectes/calendrier\.ics\?secteurs=(\d+)', html_content)
+        if ics_match:
+            secteur = ics_match.group(1)
+            return f"{BASE_URL}/avis/collectes/calendrier.ics?secteurs={secteur}"
+
+        _LOGGER.error("Impossible de trouver le lien .ics dans la réponse")
+        return None
+
+    async def _async_fetch_sector(
+        self, ics_url: str, previous: SectorEntry | None
+    ) -> SectorEntry:
+        """Télécharger et parser le calendrier d'un secteur.
+
+        La requête est conditionnelle (``If-None-Match``/``If-Modified-Since``)
+        et le parsing est évité si le contenu est identique octet pour octet.
+        """
+        today = datetime.now(TIMEZONE).date()
+
+        # Sans contenu brut (entrée restaurée), un 304 n'est utile que si le
+        # calendrier a déjà été parsé aujourd'hui
+        headers = {}
+        if previous is not None and (
+            previous.content is not None or previous.parsed_on == today
+        ):
+            if previous.etag:
+                headers[hdrs.IF_NONE_MATCH] = previous.etag
+            if previous.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = previous.last_modified
+
+        with self._stats.measure("download"):
+            async with async_request(
+                self.hass, hdrs.METH_GET, ics_url, headers=headers
+            ) as ics_response:
+                if ics_response.status == 404:
+                    raise IcsNotFound(ics_url)
+                if ics_response.status == 304 and previous is not None:
+                    _LOGGER.debug("Calendrier inchangé (304): %s", ics_url)
+                    self._stats.counters["not_modified"] += 1
+                    ics_content = previous.content
+                    etag = previous.etag
+                    last_modified = previous.last_modified
+                else:
+                    ics_response.raise_for_status()
+                    ics_content = await ics_response.read()
+                    self._stats.counters["downloads"] += 1
+                    self._stats.counters["bytes_downloaded"] += len(ics_content)
+                    etag = ics_response.headers.get(hdrs.ETAG)
+                    last_modified = ics_response.headers.get(hdrs.LAST_MODIFIED)
+
+        if ics_content is None:
+            digest = previous.digest
+        else:
+            digest = hashlib.sha256(ics_content).hexdigest()
+
+        # La fenêtre commence aujourd'hui : un contenu identique parsé
+        # aujourd'hui donne exactement le même résultat
+        unchanged = previous is not None and previous.digest == digest
+        if unchanged and previous.parsed_on == today:
+            _LOGGER.debug("Contenu identique, parsing évité: %s", ics_url)
+            self._stats.counters["parse_skipped"] += 1
+            data = previous.data.with_last_update(datetime.now())
+            expansion = previous.expansion
+        elif unchanged and previous.expansion is not None:
+            # Contenu identique un autre jour : faire glisser la fenêtre
+            _LOGGER.debug("Contenu identique, fenêtre avancée: %s", ics_url)
+            expansion = previous.expansion
+            data = await self._async_slide(expansion)
+        else:
+            expansion, data = await self._parse_ics(ics_content)
+
+        entry = SectorEntry(
+            content=ics_content,
+            data=data,
+            fetched_at=dt_util.utcnow(),
+            etag=etag,
+            last_modified=last_modified,
+            digest=digest,
+            parsed_on=today,
+            expansion=expansion,
+        )
+
+        # Conserver le calendrier pour le prochain démarrage
+        (await async_get_schedule_store(self.hass)).async_set(
+            sector_from_url(ics_url), entry
+        )
+        return entry
+
+    async def _parse_ics(self, ics_content: bytes) -> tuple[EventExpansion, Schedule]:
+        """Parser le contenu ICS dans l'exécuteur, sans bloquer la boucle."""
+        async with async_get_parse_semaphore(self.hass):
+            try:
+                expansion, data = await self.hass.async_add_executor_job(
+                    expand_ics, ics_content, self._window_days
+                )
+            except Exception:
+                self._stats.errors["parse"] += 1
+                raise
+            self._record_timings(expansion)
+            self._stats.counters["scanned" if expansion.scanned else "library_parsed"] += 1
+            return expansion, data
+
+    async def _async_slide(self, expansion: EventExpansion) -> Schedule:
+        """Avancer la fenêtre des occurrences dans l'exécuteur."""
+        async with async_get_parse_semaphore(self.hass):
+            try:
+                data = await self.hass.async_add_executor_job(
+                    expansion.slide, self._window_days
+                )
+            except Exception:
+                self._stats.errors["slide"] += 1
+                raise
+            self._record_timings(expansion)
+            return data
+
+    def _record_timings(self, expansion: EventExpansion) -> None:
+        """Enregistrer les durées mesurées dans l'exécuteur."""
+        for stage, duration in expansion.timings.items():
+            self._stats.record(stage, duration)
 
-    async def async_close(self):
-        """Fermer la session."""
-        if self._session:
-            await self._session.close()
+    @property
+    def _window_days(self) -> int:
+        """Retourner la longueur de la fenêtre d'expansion, en jours."""
+        return self.hass.data.get(DATA_WINDOW_DAYS, DEFAULT_WINDOW_DAYS)
@@ -7,7 +7,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.selector import (
@@ -17,9 +17,18 @@ from homeassistant.helpers.selector import (
     TextSelector,
     TextSelectorConfig,
     TextSelectorType,
+    TimeSelector,
 )
 
-from .const import DOMAIN
+from .catalog import async_get_civic_catalog, async_get_street_catalog
+from .const import (
+    CONF_LEAD_DAYS,
+    CONF_NOTIFICATION_TIME,
+    DEFAULT_LEAD_DAYS,
+    DEFAULT_NOTIFICATION_TIME,
+    DOMAIN,
+    MAX_LEAD_DAYS,
+)
 from .collector import CollectesCollector
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,18 +37,20 @@ _LOGGER = logging.getLogger(__name__)
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Valider l'entrée utilisateur."""
     collector = CollectesCollector(
+        hass,
         street=data["street"],
         civic_number=data["civic_number"]
     )
 
-    # Tenter de récupérer les données pour valider l'adresse
+    # Résoudre l'adresse et vérifier le calendrier sans le télécharger ;
+    # l'adresse résolue est réutilisée par l'entrée créée
     try:
-        collectes = await collector.async_get_collectes()
-        if not collectes:
-            raise InvalidAddress
+        valid = await collector.async_validate()
     except Exception as err:
         _LOGGER.error("Erreur lors de la validation: %s", err)
         raise CannotConnect from err
+    if not valid:
+        raise InvalidAddress
 
     # Retourner un titre pour l'intégration (numéro affiché + rue)
     displayed_number = data.get("displayed_number", data["civic_number"])
@@ -56,6 +67,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._streets = []
         self._selected_street = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Retourner le flux d'options."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -64,7 +83,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         # Récupérer la liste des rues si on ne l'a pas encore
         if not self._streets:
-            self._streets = await CollectesCollector.async_get_streets()
+            self._streets = await async_get_street_catalog(self.hass).async_get_streets()
             
             # Si on ne peut pas récupérer les rues, permettre la saisie manuelle
             if not self._streets:
@@ -131,7 +150,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=info["title"], data=full_data)
 
         # Essayer de récupérer les numéros civiques pour cette rue
-        civic_numbers_dict = await CollectesCollector.async_get_civic_numbers(self._selected_street)
+        civic_numbers_dict = await async_get_civic_catalog(self.hass).async_get_civic_numbers(
+            self._selected_street
+        )
         
         if civic_numbers_dict:
             # Stocker le mapping pour plus tard
@@ -168,6 +189,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"street": self._selected_street},
         )
 
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Créer une entrée pour une adresse déjà validée par l'importation."""
+        self._async_abort_entries_match(
+            {
+                "street": import_data["street"],
+                "civic_number": import_data["civic_number"],
+            }
+        )
+        displayed_number = import_data.get("displayed_number", import_data["civic_number"])
+        return self.async_create_entry(
+            title=f"Collectes au {displayed_number} {import_data['street']}",
+            data=import_data,
+        )
+
     async def async_step_manual(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -203,6 +238,51 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Gérer les rappels de collecte d'une adresse."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialiser le flux d'options."""
+        # Les versions récentes de Home Assistant fournissent config_entry et
+        # refusent qu'on l'assigne : garder l'entrée dans un attribut privé
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choisir les délais et l'heure des événements de collecte à venir."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_LEAD_DAYS: sorted(int(lead) for lead in user_input[CONF_LEAD_DAYS]),
+                    CONF_NOTIFICATION_TIME: user_input[CONF_NOTIFICATION_TIME],
+                },
+            )
+
+        options = self._entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_LEAD_DAYS,
+                    default=[str(lead) for lead in options.get(CONF_LEAD_DAYS, DEFAULT_LEAD_DAYS)],
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[str(lead) for lead in range(MAX_LEAD_DAYS + 1)],
+                        multiple=True,
+                        mode=SelectSelectorMode.LIST,
+                    )
+                ),
+                vol.Required(
+                    CONF_NOTIFICATION_TIME,
+                    default=options.get(CONF_NOTIFICATION_TIME, DEFAULT_NOTIFICATION_TIME),
+                ): TimeSelector(),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema)
+
+
 class CannotConnect(HomeAssistantError):
     """Erreur pour indiquer que nous ne pouvons pas nous connecter."""
 
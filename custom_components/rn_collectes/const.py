@@ -1,4 +1,6 @@
 """Constantes pour l'intégration Rouyn-Noranda Collectes."""
+from datetime import timedelta
+from zoneinfo import ZoneInfo
 
 DOMAIN = "rn_collectes"
 
@@ -21,3 +23,110 @@ COLLECTE_TYPES = [
 
 # URL de base
 BASE_URL = "https://citoyen.rouyn-noranda.ca"
+
+# Fuseau horaire de Rouyn-Noranda
+TIMEZONE = ZoneInfo("America/Toronto")
+
+# Cache partagé des calendriers ICS, indexé par secteur
+DATA_SECTOR_CACHE = f"{DOMAIN}_sector_cache"
+SECTOR_CACHE_TTL = timedelta(hours=6)
+
+# Résolution adresse → URL du calendrier, conservée entre les redémarrages
+DATA_ADDRESS_STORE = f"{DOMAIN}_address_store"
+STORAGE_VERSION = 1
+ADDRESS_STORAGE_KEY = f"{DOMAIN}.addresses"
+ADDRESS_RESOLUTION_MAX_AGE = timedelta(days=30)
+STORAGE_SAVE_DELAY = 10
+
+# Derniers calendriers parsés, restaurés au démarrage
+DATA_SCHEDULE_STORE = f"{DOMAIN}_schedule_store"
+SCHEDULE_STORAGE_KEY = f"{DOMAIN}.schedules"
+
+# Parsing dans l'exécuteur
+CONF_PARSE_CONCURRENCY = "parse_concurrency"
+DATA_PARSE_SEMAPHORE = f"{DOMAIN}_parse_semaphore"
+DEFAULT_PARSE_CONCURRENCY = 2
+
+# Surveillance du blocage de la boucle d'événements
+DATA_LOOP_MONITOR = f"{DOMAIN}_loop_monitor"
+LOOP_MONITOR_INTERVAL = 0.5
+LOOP_BLOCKED_THRESHOLD = 0.1
+
+# Session HTTP partagée
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_REQUEST_SEMAPHORE = f"{DOMAIN}_request_semaphore"
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT = 30
+
+# Planification des rafraîchissements
+UPDATE_INTERVAL = timedelta(hours=12)
+REFRESH_JITTER = timedelta(minutes=30)
+RETRY_BASE_DELAY = timedelta(minutes=5)
+
+# Limite de débit des requêtes sortantes (seau à jetons)
+DATA_TOKEN_BUCKET = f"{DOMAIN}_token_bucket"
+REQUEST_RATE = 1.0
+REQUEST_BURST = 5
+
+# Catalogue des rues, partagé par tous les flux de configuration
+DATA_STREET_CATALOG = f"{DOMAIN}_street_catalog"
+STREET_STORAGE_KEY = f"{DOMAIN}.streets"
+STREET_CATALOG_TTL = timedelta(days=7)
+STREAM_CHUNK_SIZE = 16384
+
+# Numéros civiques par rue (cache LRU partagé et conservé sur disque)
+CONF_WARM_CIVIC_CATALOG = "warm_civic_catalog"
+DATA_CIVIC_CATALOG = f"{DOMAIN}_civic_catalog"
+CIVIC_STORAGE_KEY = f"{DOMAIN}.civic_numbers"
+CIVIC_CATALOG_SIZE = 64
+CIVIC_CATALOG_TTL = timedelta(days=7)
+
+# Importation groupée d'adresses
+CONF_ADDRESSES = "addresses"
+CONF_CIVIC_NUMBER = "civic_number"
+CONF_DISPLAYED_NUMBER = "displayed_number"
+CONF_STREET = "street"
+SERVICE_IMPORT_ADDRESSES = "import_addresses"
+IMPORT_WORKERS = 4
+
+# Fenêtre d'expansion des récurrences
+CONF_WINDOW_DAYS = "window_days"
+DATA_WINDOW_DAYS = f"{DOMAIN}_window_days"
+DEFAULT_WINDOW_DAYS = 365
+
+# Changement de jour local
+DATA_DAY_ROLLOVER = f"{DOMAIN}_day_rollover"
+SIGNAL_DAY_CHANGED = f"{DOMAIN}_day_changed"
+
+# Écritures d'état des entités
+DATA_WRITE_COUNTER = f"{DOMAIN}_write_counter"
+
+# Prochaines collectes à la demande
+CONF_CONFIG_ENTRY_ID = "config_entry_id"
+CONF_COUNT = "count"
+CONF_TYPE_COLLECTE = "type_collecte"
+DEFAULT_UPCOMING_COUNT = 5
+SERVICE_GET_UPCOMING_COLLECTIONS = "get_upcoming_collections"
+
+# Mesures des rafraîchissements
+DATA_COLLECTOR_STATS = f"{DOMAIN}_collector_stats"
+
+# Coordinateurs partagés par les adresses d'un même secteur
+DATA_SECTOR_COORDINATORS = f"{DOMAIN}_sector_coordinators"
+
+# Événements de collectes à venir
+EVENT_UPCOMING_COLLECTION = f"{DOMAIN}_upcoming_collection"
+CONF_LEAD_DAYS = "lead_days"
+CONF_NOTIFICATION_TIME = "notification_time"
+MAX_LEAD_DAYS = 7
+DEFAULT_LEAD_DAYS = [1]
+DEFAULT_NOTIFICATION_TIME = "18:00:00"
+
+# Rappels demandés par les automatisations du blueprint (délai et heure
+# lus dans leur déclencheur)
+DATA_AUTOMATION_REMINDERS = f"{DOMAIN}_automation_reminders"
+SIGNAL_REMINDERS_CHANGED = f"{DOMAIN}_reminders_changed"
+# Domaine et événement de rechargement des automatisations, repris ici pour
+# ne pas importer le composant automation
+AUTOMATION_DOMAIN = "automation"
+EVENT_AUTOMATION_RELOADED = "automation_reloaded"
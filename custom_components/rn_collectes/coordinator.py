@@ -0,0 +1,376 @@
+"""Coordinateur de mises à jour pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from functools import partial
+import logging
+import random
+from time import perf_counter
+from typing import NamedTuple
+
+from homeassistant import config_entries
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .collector import CollectesCollector, IcsNotFound, sector_from_url
+from .const import (
+    COLLECTE_TYPES,
+    DATA_SECTOR_COORDINATORS,
+    DOMAIN,
+    REFRESH_JITTER,
+    RETRY_BASE_DELAY,
+    SIGNAL_DAY_CHANGED,
+    UPDATE_INTERVAL,
+)
+from .rollover import async_get_day_rollover, async_stop_day_rollover
+from .schedule import Schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _jittered(interval: timedelta) -> timedelta:
+    """Décaler un intervalle d'au plus ``REFRESH_JITTER`` dans un sens ou l'autre."""
+    jitter = REFRESH_JITTER.total_seconds()
+    return interval + timedelta(seconds=random.uniform(-jitter, jitter))
+
+
+class TypeSummary(NamedTuple):
+    """État calculé d'un capteur de type de collecte."""
+
+    native_value: str | None
+    attributes: dict[str, any]
+    # Attributs qui déterminent l'état, sans la date de dernière mise à jour :
+    # celle-ci n'est écrite qu'avec un autre changement
+    fingerprint: tuple = ()
+
+
+EMPTY_SUMMARY = TypeSummary(None, {})
+
+
+def summarize(schedule: Schedule, collecte_type: str, today: date) -> TypeSummary:
+    """Calculer la valeur et les attributs d'un type de collecte pour un jour."""
+    if not schedule.has_type(collecte_type):
+        return EMPTY_SUMMARY
+
+    upcoming = schedule.upcoming(today, collecte_type, 5)
+    next_collecte = upcoming[0] if upcoming else None
+    prochaine_date = None
+    jours_restants = None
+
+    if next_collecte:
+        prochaine_date = next_collecte.date.strftime('%Y-%m-%d')
+        # Nombre de jours calendaires avant la collecte (0 = aujourd'hui)
+        jours_restants = (next_collecte.date.date() - today).days
+
+    last_update = schedule.last_update
+    prochaines_collectes = [
+        {
+            'date': collecte.date.strftime('%Y-%m-%d'),
+            'summary': collecte.summary
+        }
+        for collecte in upcoming
+    ]
+
+    return TypeSummary(
+        prochaine_date,
+        {
+            'type_collecte': collecte_type,
+            'jours_restants': jours_restants,
+            'prochaine_date': prochaine_date,
+            'description': next_collecte.description if next_collecte else None,
+            'prochaines_collectes': prochaines_collectes,
+            'derniere_mise_a_jour': last_update.isoformat() if last_update else None,
+            'integration': DOMAIN,
+            'days_until': jours_restants,
+        },
+        (
+            jours_restants,
+            next_collecte.description if next_collecte else None,
+            tuple((collecte['date'], collecte['summary']) for collecte in prochaines_collectes),
+        ),
+    )
+
+
+class CollectesCoordinator(DataUpdateCoordinator[Schedule | None]):
+    """Coordinateur dont les rafraîchissements sont étalés dans le temps.
+
+    Chaque intervalle est décalé aléatoirement pour que les entrées
+    configurées ensemble ne rafraîchissent pas à la même seconde, et les
+    échecs sont réessayés avec un délai exponentiel plutôt qu'après 12 heures.
+
+    L'état des capteurs (``summaries``, un ``TypeSummary`` par type) est
+    calculé une fois à chaque mise à jour des données et à chaque changement
+    de jour, puis simplement lu par les capteurs.
+
+    Un coordinateur sert toutes les entrées d'un même secteur (voir
+    ``SectorCoordinators``).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_method: Callable[[], Awaitable[Schedule | None]],
+        sector: str | None = None,
+    ) -> None:
+        """Initialiser le coordinateur."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {sector}" if sector else DOMAIN,
+            update_method=update_method,
+            update_interval=_jittered(UPDATE_INTERVAL),
+        )
+        self._failures = 0
+        # Durée du dernier rafraîchissement réussi, en secondes
+        self.last_refresh_duration: float | None = None
+        self._rollover = async_get_day_rollover(hass)
+        self.summaries: dict[str, TypeSummary] = {}
+
+    @property
+    def today(self) -> date:
+        """Retourner le jour local courant."""
+        return self._rollover.today
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Recalculer l'état des capteurs puis prévenir les entités."""
+        if self.data:
+            today = self._rollover.today
+            self.summaries = {
+                collecte_type: summarize(self.data, collecte_type, today)
+                for collecte_type in COLLECTE_TYPES
+            }
+        else:
+            self.summaries = {}
+        super().async_update_listeners()
+
+    @callback
+    def async_day_changed(self) -> None:
+        """Mettre les entités à jour au changement de jour."""
+        self.async_update_listeners()
+
+    async def _async_update_data(self) -> Schedule | None:
+        """Rafraîchir les données et planifier le prochain intervalle."""
+        start = perf_counter()
+        try:
+            data = await super()._async_update_data()
+        except Exception:
+            self._failures += 1
+            delay = RETRY_BASE_DELAY * 2 ** min(self._failures - 1, 10)
+            self.update_interval = min(
+                delay * random.uniform(1, 1.2), _jittered(UPDATE_INTERVAL)
+            )
+            _LOGGER.debug(
+                "Échec n°%s du rafraîchissement, nouvel essai dans %s",
+                self._failures,
+                self.update_interval,
+            )
+            raise
+
+        self._failures = 0
+        self.last_refresh_duration = perf_counter() - start
+        self.update_interval = _jittered(UPDATE_INTERVAL)
+        return data
+
+
+@dataclass(slots=True)
+class _SharedCoordinator:
+    """Coordinateur d'un secteur et entrées qui l'utilisent."""
+
+    coordinator: CollectesCoordinator
+    # URL du calendrier du secteur, None pour une adresse non résolue
+    ics_url: str | None
+    # Premier rafraîchissement, attendu par chaque entrée qui se rattache
+    ready: asyncio.Task[None]
+    unsub_day_changed: CALLBACK_TYPE
+    # Arrêt avec Home Assistant, None une fois déclenché
+    unsub_stop: CALLBACK_TYPE | None = None
+    # Collecteur de l'adresse de chaque entrée rattachée
+    entries: dict[str, CollectesCollector] = field(default_factory=dict)
+
+
+class SectorCoordinators:
+    """Coordinateurs partagés par les entrées d'un même secteur.
+
+    Toutes les adresses d'un secteur reçoivent le même calendrier : un seul
+    ``CollectesCoordinator`` (un cycle de rafraîchissement, une minuterie,
+    un jeu de résumés) sert leurs entrées. Chaque entrée prend une référence
+    à sa configuration et la rend à son déchargement ou à l'échec de sa
+    configuration ; le coordinateur est arrêté avec la dernière.
+
+    Le coordinateur d'un secteur charge le calendrier par l'URL du secteur,
+    jamais par l'adresse d'une entrée. À chaque rafraîchissement, les
+    adresses dont la résolution est à revérifier sont soumises de nouveau au
+    portail ; une entrée dont l'adresse a changé de secteur, ou dont le
+    calendrier a disparu (404), est rechargée et rejoint le bon coordinateur.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialiser sans coordinateur."""
+        self.hass = hass
+        self._sectors: dict[str, _SharedCoordinator] = {}
+        # Secteur de chaque entrée rattachée
+        self._entries: dict[str, str] = {}
+        # Collecteur sans adresse, pour les calendriers de secteur
+        self._loader = CollectesCollector(hass)
+
+    async def async_acquire(
+        self, entry_id: str, ics_url: str | None, collector: CollectesCollector
+    ) -> CollectesCoordinator:
+        """Rattacher une entrée au coordinateur de son secteur, créé au besoin.
+
+        ``ics_url`` est l'URL du calendrier de l'adresse de ``collector`` ;
+        une adresse que le portail ne reconnaît pas (``None``) garde un
+        coordinateur propre, chargé par son collecteur. Lève
+        ``ConfigEntryNotReady`` si le premier rafraîchissement échoue.
+        """
+        sector = sector_from_url(ics_url) if ics_url is not None else entry_id
+        if (shared := self._sectors.get(sector)) is None:
+            if ics_url is not None:
+                update_method = partial(self._async_update_sector, sector, ics_url)
+            else:
+                update_method = collector.async_get_collectes
+            # Le coordinateur n'appartient pas à l'entrée qui le crée : hors
+            # de son contexte, il ne s'arrête pas à son déchargement et seul
+            # async_release l'arrête
+            token = config_entries.current_entry.set(None)
+            try:
+                coordinator = CollectesCoordinator(self.hass, update_method, sector)
+                shared = self._sectors[sector] = _SharedCoordinator(
+                    coordinator,
+                    ics_url,
+                    self.hass.async_create_task(
+                        self._async_first_refresh(coordinator, ics_url),
+                        f"{DOMAIN} first refresh {sector}",
+                    ),
+                    # Recalculer l'état des capteurs à minuit (minuterie partagée)
+                    async_dispatcher_connect(
+                        self.hass, SIGNAL_DAY_CHANGED, coordinator.async_day_changed
+                    ),
+                )
+            finally:
+                config_entries.current_entry.reset(token)
+            # Sans entrée, le coordinateur s'arrête aussi avec Home Assistant
+            shared.unsub_stop = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, partial(self._async_on_hass_stop, shared)
+            )
+        shared.entries[entry_id] = collector
+        self._entries[entry_id] = sector
+
+        try:
+            await asyncio.shield(shared.ready)
+        except BaseException:
+            await self.async_release(entry_id)
+            raise
+        return shared.coordinator
+
+    async def async_release(self, entry_id: str) -> None:
+        """Détacher une entrée et arrêter le coordinateur s'il n'en sert plus aucune."""
+        if (sector := self._entries.pop(entry_id, None)) is None:
+            return
+        shared = self._sectors[sector]
+        shared.entries.pop(entry_id, None)
+        if shared.entries:
+            return
+
+        del self._sectors[sector]
+        shared.unsub_day_changed()
+        if shared.unsub_stop is not None:
+            shared.unsub_stop()
+        shared.ready.cancel()
+        await shared.coordinator.async_shutdown()
+
+        # La minuterie de minuit ne sert qu'aux coordinateurs
+        if not self._sectors:
+            async_stop_day_rollover(self.hass)
+
+    async def _async_on_hass_stop(self, shared: _SharedCoordinator, _: Event) -> None:
+        """Arrêter un coordinateur avec Home Assistant."""
+        shared.unsub_stop = None
+        await shared.coordinator.async_shutdown()
+
+    def as_dict(self) -> dict[str, any]:
+        """Retourner le nombre de coordinateurs et d'entrées rattachées."""
+        return {"coordinators": len(self._sectors), "entries": len(self._entries)}
+
+    async def _async_first_refresh(
+        self, coordinator: CollectesCoordinator, ics_url: str | None
+    ) -> None:
+        """Charger les premières données du coordinateur."""
+        if (
+            ics_url is not None
+            and (schedule := await self._loader.async_restore_sector(ics_url)) is not None
+        ):
+            # Afficher le dernier calendrier connu et rafraîchir en arrière-plan
+            coordinator.async_set_updated_data(schedule)
+            self.hass.async_create_background_task(
+                coordinator.async_refresh(), f"{DOMAIN} refresh {coordinator.name}"
+            )
+        else:
+            # Récupération initiale des données ; le coordinateur n'a pas
+            # d'entrée, async_config_entry_first_refresh ne s'applique pas
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise ConfigEntryNotReady(
+                    f"Premier rafraîchissement impossible: {coordinator.last_exception}"
+                ) from coordinator.last_exception
+
+    async def _async_update_sector(self, sector: str, ics_url: str) -> Schedule:
+        """Charger le calendrier d'un secteur et vérifier les adresses rattachées."""
+        shared = self._sectors.get(sector)
+        entries = dict(shared.entries) if shared is not None else {}
+        try:
+            schedule = await self._loader.async_get_sector_collectes(ics_url)
+        except IcsNotFound:
+            # Le calendrier a disparu : les adresses du secteur doivent être
+            # résolues à nouveau, au rechargement de leur entrée
+            _LOGGER.info("Calendrier introuvable pour le secteur %s: %s", sector, ics_url)
+            await self._loader.async_forget_sector(ics_url)
+            self._async_reload_entries(entries)
+            raise
+
+        # Revérifier les résolutions anciennes (aucune requête sinon)
+        results = await asyncio.gather(
+            *(collector.async_resolve_ics_url() for collector in entries.values()),
+            return_exceptions=True,
+        )
+        moved = []
+        for entry_id, result in zip(entries, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Revérification de l'adresse impossible: %s", result)
+            elif result is not None and sector_from_url(result) != sector:
+                moved.append(entry_id)
+        if moved:
+            _LOGGER.info("Adresses déplacées hors du secteur %s: %s", sector, moved)
+            self._async_reload_entries(moved)
+
+        return schedule
+
+    @callback
+    def _async_reload_entries(self, entry_ids: Iterable[str]) -> None:
+        """Recharger les entrées chargées, pour les rattacher au bon secteur.
+
+        Une entrée en cours de configuration n'est pas rechargée : l'échec de
+        son premier rafraîchissement la fera réessayer.
+        """
+        for entry_id in entry_ids:
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            if entry is not None and entry.state is config_entries.ConfigEntryState.LOADED:
+                self.hass.async_create_task(
+                    self.hass.config_entries.async_reload(entry_id),
+                    f"{DOMAIN} reload {entry_id}",
+                )
+
+
+@callback
+def async_get_sector_coordinators(hass: HomeAssistant) -> SectorCoordinators:
+    """Retourner le registre des coordinateurs de secteur."""
+    if (coordinators := hass.data.get(DATA_SECTOR_COORDINATORS)) is None:
+        coordinators = hass.data[DATA_SECTOR_COORDINATORS] = SectorCoordinators(hass)
+    return coordinators
@@ -0,0 +1,47 @@
+"""Diagnostics pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .cache import async_get_sector_cache
+from .const import DATA_LOOP_MONITOR, DOMAIN
+from .coordinator import CollectesCoordinator, async_get_sector_coordinators
+from .metrics import async_get_collector_stats, async_get_write_counter
+from .parser import CLASSIFIER
+
+# L'adresse identifie le domicile de l'utilisateur
+TO_REDACT = {"street", "civic_number", "displayed_number", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, any]:
+    """Retourner les diagnostics d'une entrée de configuration."""
+    coordinator: CollectesCoordinator = hass.data[DOMAIN][entry.entry_id]
+    schedule = coordinator.data
+    monitor = hass.data.get(DATA_LOOP_MONITOR)
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "last_refresh_ms": (
+                round(coordinator.last_refresh_duration * 1000, 1)
+                if coordinator.last_refresh_duration is not None
+                else None
+            ),
+            "events": len(schedule) if schedule else 0,
+            "last_update": (
+                schedule.last_update.isoformat() if schedule and schedule.last_update else None
+            ),
+        },
+        "sector_coordinators": async_get_sector_coordinators(hass).as_dict(),
+        "collector": async_get_collector_stats(hass).as_dict(),
+        "sector_cache": async_get_sector_cache(hass).as_dict(),
+        "state_writes": async_get_write_counter(hass).as_dict(),
+        "unmatched_summaries": CLASSIFIER.unmatched_as_dict(),
+        "event_loop": monitor.as_dict() if monitor is not None else None,
+    }
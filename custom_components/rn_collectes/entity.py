@@ -0,0 +1,47 @@
+"""Entité de base pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import CollectesCoordinator
+from .metrics import async_get_write_counter
+
+
+class CollectesEntity(CoordinatorEntity[CollectesCoordinator], ABC):
+    """Entité qui n'écrit son état que s'il a réellement changé.
+
+    Un rafraîchissement qui retourne le même calendrier ne modifie que la
+    date de dernière mise à jour : l'écriture est alors évitée, et avec elle
+    une ligne d'historique dans le recorder. Les attributs absents de
+    l'empreinte (``derniere_mise_a_jour``) gardent donc la valeur de la
+    dernière écriture ; tout ce qui est affiché d'autre, dont
+    ``prochaines_collectes``, en fait partie.
+    """
+
+    _fingerprint: Hashable | None = None
+
+    @abstractmethod
+    def _state_fingerprint(self) -> Hashable:
+        """Retourner une empreinte peu coûteuse de l'état calculé."""
+
+    async def async_added_to_hass(self) -> None:
+        """Mémoriser l'état écrit à l'ajout de l'entité."""
+        await super().async_added_to_hass()
+        self._fingerprint = (self.available, self._state_fingerprint())
+        async_get_write_counter(self.hass).written += 1
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Écrire l'état seulement s'il a changé."""
+        fingerprint = (self.available, self._state_fingerprint())
+        counter = async_get_write_counter(self.hass)
+        if fingerprint == self._fingerprint:
+            counter.skipped += 1
+            return
+        self._fingerprint = fingerprint
+        counter.written += 1
+        self.async_write_ha_state()
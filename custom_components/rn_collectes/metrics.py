@@ -0,0 +1,206 @@
+"""Mesures de performance pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+from time import perf_counter
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_COLLECTOR_STATS,
+    DATA_WRITE_COUNTER,
+    LOOP_BLOCKED_THRESHOLD,
+    LOOP_MONITOR_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Mesurer le temps pendant lequel la boucle d'événements est bloquée.
+
+    Un rappel est planifié à intervalle fixe ; le retard avec lequel il
+    s'exécute correspond au temps pendant lequel la boucle n'a pas pu
+    reprendre la main.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold: float = LOOP_BLOCKED_THRESHOLD,
+    ) -> None:
+        """Initialiser la surveillance."""
+        self.hass = hass
+        self._interval = interval
+        self._threshold = threshold
+        self._expected: float | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.blocked_count = 0
+        self.blocked_time = 0.0
+
+    @callback
+    def async_start(self) -> None:
+        """Démarrer la surveillance."""
+        if self._handle is None:
+            self._schedule()
+
+    @callback
+    def async_stop(self, *_: any) -> None:
+        """Arrêter la surveillance."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    @callback
+    def _schedule(self) -> None:
+        """Planifier le prochain échantillon."""
+        loop = self.hass.loop
+        self._expected = loop.time() + self._interval
+        self._handle = loop.call_at(self._expected, self._tick)
+
+    @callback
+    def _tick(self) -> None:
+        """Enregistrer le retard du rappel."""
+        lag = max(0.0, self.hass.loop.time() - self._expected)
+        self.samples += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self._threshold:
+            self.blocked_count += 1
+            self.blocked_time += lag
+            _LOGGER.debug("Boucle d'événements bloquée pendant %.0f ms", lag * 1000)
+        self._schedule()
+
+    def as_dict(self) -> dict[str, any]:
+        """Retourner les mesures."""
+        return {
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "blocked_count": self.blocked_count,
+            "blocked_time_ms": round(self.blocked_time * 1000, 1),
+        }
+
+
+class StateWriteCounter:
+    """Compter les écritures d'état des entités et celles évitées.
+
+    Chaque écriture produit une ligne dans la base du recorder : le rapport
+    entre les deux compteurs mesure le volume économisé.
+    """
+
+    def __init__(self) -> None:
+        """Initialiser les compteurs."""
+        self.written = 0
+        self.skipped = 0
+
+    def as_dict(self) -> dict[str, any]:
+        """Retourner les compteurs."""
+        return {"written": self.written, "skipped": self.skipped}
+
+
+@callback
+def async_get_write_counter(hass: HomeAssistant) -> StateWriteCounter:
+    """Retourner le compteur partagé par toutes les entités."""
+    if (counter := hass.data.get(DATA_WRITE_COUNTER)) is None:
+        counter = hass.data[DATA_WRITE_COUNTER] = StateWriteCounter()
+    return counter
+
+
+# Bornes supérieures des classes des histogrammes de durée, en millisecondes
+TIMING_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class TimingHistogram:
+    """Répartition des durées d'une étape."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialiser un histogramme vide."""
+        self.buckets = [0] * (len(TIMING_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        """Ajouter une durée, en secondes."""
+        duration_ms = duration * 1000
+        self.buckets[bisect_left(TIMING_BUCKETS, duration_ms)] += 1
+        self.count += 1
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+
+    @property
+    def mean(self) -> float | None:
+        """Retourner la durée moyenne, en millisecondes."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, any]:
+        """Retourner l'histogramme."""
+        labels = [f"<={bound}" for bound in TIMING_BUCKETS] + [f">{TIMING_BUCKETS[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean, 1) if self.count else None,
+            "max_ms": round(self.max, 1),
+            "buckets_ms": dict(zip(labels, self.buckets)),
+        }
+
+
+class CollectorStats:
+    """Durées par étape et compteurs des rafraîchissements.
+
+    Les étapes mesurées sont la résolution de l'adresse (``resolve``), le
+    téléchargement du calendrier (``download``), la lecture du fichier
+    (``parse``), l'expansion des récurrences (``expand``), la classification
+    des résumés (``classify``) et l'avance de la fenêtre (``slide``).
+    """
+
+    def __init__(self) -> None:
+        """Initialiser les mesures."""
+        self.timings: dict[str, TimingHistogram] = {}
+        self.counters: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    def record(self, stage: str, duration: float) -> None:
+        """Enregistrer la durée d'une étape, en secondes."""
+        if (histogram := self.timings.get(stage)) is None:
+            histogram = self.timings[stage] = TimingHistogram()
+        histogram.record(duration)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Mesurer la durée d'un bloc et compter ses erreurs."""
+        start = perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[stage] += 1
+            raise
+        finally:
+            self.record(stage, perf_counter() - start)
+
+    def as_dict(self) -> dict[str, any]:
+        """Retourner les mesures."""
+        return {
+            "timings": {stage: histogram.as_dict() for stage, histogram in self.timings.items()},
+            "counters": dict(self.counters),
+            "errors": dict(self.errors),
+        }
+
+
+@callback
+def async_get_collector_stats(hass: HomeAssistant) -> CollectorStats:
+    """Retourner les mesures partagées par tous les collecteurs."""
+    if (stats := hass.data.get(DATA_COLLECTOR_STATS)) is None:
+        stats = hass.data[DATA_COLLECTOR_STATS] = CollectorStats()
+    return stats
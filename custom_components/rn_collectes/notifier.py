@@ -0,0 +1,319 @@
+"""Événements de collectes à venir pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_COMPONENT_LOADED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    AUTOMATION_DOMAIN,
+    COLLECTE_TYPES,
+    CONF_LEAD_DAYS,
+    CONF_NOTIFICATION_TIME,
+    DATA_AUTOMATION_REMINDERS,
+    DEFAULT_LEAD_DAYS,
+    DEFAULT_NOTIFICATION_TIME,
+    DOMAIN,
+    EVENT_AUTOMATION_RELOADED,
+    EVENT_UPCOMING_COLLECTION,
+    MAX_LEAD_DAYS,
+    SIGNAL_REMINDERS_CHANGED,
+    TIMEZONE,
+)
+from .coordinator import CollectesCoordinator
+from .schedule import Schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AutomationReminders:
+    """Rappels demandés par les automatisations du blueprint.
+
+    Le blueprint garde son entrée « Heure de notification » : son
+    déclencheur filtre l'événement sur ``device_id``, ``jours_restants`` et
+    ``heure``. Les automatisations chargées sont parcourues au démarrage, au
+    chargement du composant automation et à chaque rechargement ; chaque couple (délai, heure)
+    demandé pour un appareil est émis en plus des rappels des options de
+    l'entrée, sans que l'utilisateur ait à les reporter.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialiser sans rappel demandé."""
+        self.hass = hass
+        # Couples (délai, heure) demandés, par appareil
+        self.by_device: dict[str, frozenset[tuple[int, str]]] = {}
+        self._users = 0
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Suivre les automatisations pour un notificateur de plus."""
+        self._users += 1
+        if self._users == 1:
+            self._unsubs = [
+                self.hass.bus.async_listen(EVENT_AUTOMATION_RELOADED, self._async_scan),
+                self.hass.bus.async_listen(
+                    EVENT_COMPONENT_LOADED, self._async_component_loaded
+                ),
+                async_at_started(self.hass, self._async_scan),
+            ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Cesser le suivi avec le dernier notificateur."""
+        self._users -= 1
+        if self._users == 0:
+            for unsub in self._unsubs:
+                unsub()
+            self._unsubs = []
+            self.by_device = {}
+
+    @callback
+    def _async_component_loaded(self, event: Event) -> None:
+        """Lire les automatisations quand leur composant vient d'être chargé."""
+        if event.data.get("component") == AUTOMATION_DOMAIN:
+            self._async_scan()
+
+    @callback
+    def _async_scan(self, *_: any) -> None:
+        """Relire les déclencheurs des automatisations chargées."""
+        requested: dict[str, set[tuple[int, str]]] = {}
+        if (component := self.hass.data.get(AUTOMATION_DOMAIN)) is not None:
+            for automation in component.entities:
+                if not (raw_config := getattr(automation, "raw_config", None)):
+                    continue
+                for device_id, lead, heure in _requested_reminders(raw_config):
+                    requested.setdefault(device_id, set()).add((lead, heure))
+
+        by_device = {device_id: frozenset(pairs) for device_id, pairs in requested.items()}
+        if by_device != self.by_device:
+            _LOGGER.debug("Rappels demandés par les automatisations: %s", by_device)
+            self.by_device = by_device
+            async_dispatcher_send(self.hass, SIGNAL_REMINDERS_CHANGED)
+
+
+def _requested_reminders(raw_config: dict[str, any]) -> Iterator[tuple[str, int, str]]:
+    """Retourner l'appareil, le délai et l'heure de chaque déclencheur complet."""
+    triggers = raw_config.get("trigger", raw_config.get("triggers")) or []
+    if isinstance(triggers, dict):
+        triggers = [triggers]
+    for trigger in triggers:
+        if not isinstance(trigger, dict):
+            continue
+        if trigger.get("platform", trigger.get("trigger")) != "event":
+            continue
+        event_types = trigger.get("event_type")
+        if isinstance(event_types, str):
+            event_types = [event_types]
+        if not isinstance(event_types, list) or EVENT_UPCOMING_COLLECTION not in event_types:
+            continue
+
+        event_data = trigger.get("event_data")
+        if not isinstance(event_data, dict):
+            continue
+        device_id = event_data.get("device_id")
+        lead = event_data.get("jours_restants")
+        heure = event_data.get("heure")
+        if (
+            isinstance(device_id, str)
+            and isinstance(lead, (int, float))
+            and lead == int(lead)
+            and 0 <= lead <= MAX_LEAD_DAYS
+            and isinstance(heure, str)
+            and dt_util.parse_time(heure) is not None
+        ):
+            yield device_id, int(lead), heure
+
+
+@callback
+def async_get_automation_reminders(hass: HomeAssistant) -> AutomationReminders:
+    """Retourner les rappels demandés par les automatisations."""
+    if (reminders := hass.data.get(DATA_AUTOMATION_REMINDERS)) is None:
+        reminders = hass.data[DATA_AUTOMATION_REMINDERS] = AutomationReminders(hass)
+    return reminders
+
+
+class CollectionNotifier:
+    """Événements ``rn_collectes_upcoming_collection`` d'une entrée.
+
+    Pour chaque jour de collecte et chaque délai des options de l'entrée
+    (``lead_days``), un événement est émis ``lead`` jours avant, à l'heure
+    locale ``notification_time``. S'y ajoutent les couples (délai, heure)
+    demandés par les automatisations du blueprint pour l'appareil de
+    l'entrée (voir ``AutomationReminders``) ; l'heure du rappel est fournie
+    dans l'événement (``heure``). Une seule minuterie est réglée sur le
+    prochain rappel, calculé depuis le calendrier du coordinateur ; elle est
+    recalculée quand les données changent, au changement de jour, quand les
+    options sont modifiées et quand les automatisations sont rechargées. Les
+    automatisations se déclenchent sur l'événement, sans modèle qui parcourt
+    les capteurs.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, coordinator: CollectesCoordinator
+    ) -> None:
+        """Initialiser avec les options de l'entrée, sans encore planifier."""
+        self.hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._lead_days: tuple[int, ...] = ()
+        self._time = DEFAULT_NOTIFICATION_TIME
+        self._reminders = async_get_automation_reminders(hass)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_coordinator: CALLBACK_TYPE | None = None
+        self._unsub_reminders: CALLBACK_TYPE | None = None
+        # Prochain rappel et triplets (jour de collecte, délai, heure) à annoncer
+        self.next_reminder: datetime | None = None
+        self._due: list[tuple[date, int, str]] = []
+        self._set_options(entry.options)
+
+    @callback
+    def async_start(self) -> None:
+        """Suivre le coordinateur et les automatisations, planifier le premier rappel."""
+        self._unsub_coordinator = self._coordinator.async_add_listener(self._async_schedule)
+        self._reminders.async_start()
+        self._unsub_reminders = async_dispatcher_connect(
+            self.hass, SIGNAL_REMINDERS_CHANGED, self._async_schedule
+        )
+        self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Annuler la minuterie et le suivi du coordinateur et des automatisations."""
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+        if self._unsub_reminders is not None:
+            self._unsub_reminders()
+            self._unsub_reminders = None
+            self._reminders.async_stop()
+        self._cancel_timer()
+
+    @callback
+    def async_set_options(self, options: dict[str, any]) -> None:
+        """Appliquer de nouvelles options et replanifier."""
+        self._set_options(options)
+        if self._unsub_coordinator is not None:
+            self._async_schedule()
+
+    def _set_options(self, options: dict[str, any]) -> None:
+        """Lire les délais et l'heure des rappels."""
+        self._lead_days = tuple(sorted(set(options.get(CONF_LEAD_DAYS, DEFAULT_LEAD_DAYS))))
+        self._time = options.get(CONF_NOTIFICATION_TIME, DEFAULT_NOTIFICATION_TIME)
+
+    @callback
+    def _cancel_timer(self) -> None:
+        """Annuler le rappel planifié."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self.next_reminder = None
+        self._due = []
+
+    @callback
+    def _device_id(self) -> str | None:
+        """Retourner l'appareil de l'entrée."""
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self._entry.entry_id)}
+        )
+        return device.id if device else None
+
+    def _requested(self, device_id: str | None) -> set[tuple[int, str]]:
+        """Retourner les couples (délai, heure) des options et des automatisations."""
+        requested = {(lead, self._time) for lead in self._lead_days}
+        if device_id is not None:
+            requested |= self._reminders.by_device.get(device_id, frozenset())
+        return requested
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Régler la minuterie sur le prochain rappel."""
+        self._cancel_timer()
+        if not (schedule := self._coordinator.data):
+            return
+
+        now = dt_util.now(TIMEZONE)
+        for lead, heure in sorted(self._requested(self._device_id())):
+            at = dt_util.parse_time(heure)
+            # Premier jour dont le rappel n'est pas encore passé
+            first = now.date() + timedelta(days=lead)
+            if datetime.combine(now.date(), at, tzinfo=TIMEZONE) <= now:
+                first += timedelta(days=1)
+            if (day := _next_collection_day(schedule, first)) is None:
+                continue
+
+            reminder = datetime.combine(day - timedelta(days=lead), at, tzinfo=TIMEZONE)
+            if self.next_reminder is None or reminder < self.next_reminder:
+                self.next_reminder, self._due = reminder, [(day, lead, heure)]
+            elif reminder == self.next_reminder:
+                self._due.append((day, lead, heure))
+
+        if self.next_reminder is not None:
+            _LOGGER.debug(
+                "Prochain rappel de %s: %s (%s)", self._entry.title, self.next_reminder, self._due
+            )
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._async_remind, self.next_reminder
+            )
+
+    @callback
+    def _async_remind(self, now: datetime) -> None:
+        """Émettre les événements du rappel puis planifier le suivant."""
+        self._unsub_timer = None
+        if schedule := self._coordinator.data:
+            device_id = self._device_id()
+            for day, lead, heure in self._due:
+                self._fire(schedule, day, lead, heure, device_id)
+        self._async_schedule()
+
+    def _fire(
+        self, schedule: Schedule, day: date, lead: int, heure: str, device_id: str | None
+    ) -> None:
+        """Émettre l'événement d'un jour de collecte."""
+        collectes = [
+            {
+                "type_collecte": collecte_type,
+                "summary": collecte.summary,
+                "description": collecte.description,
+            }
+            for collecte_type in COLLECTE_TYPES
+            for collecte in schedule.upcoming(day, collecte_type, 1)
+            if collecte.date.date() == day
+        ]
+        if not collectes:
+            return
+
+        self.hass.bus.async_fire(
+            EVENT_UPCOMING_COLLECTION,
+            {
+                "config_entry_id": self._entry.entry_id,
+                "device_id": device_id,
+                "date": day.isoformat(),
+                "jours_restants": lead,
+                "heure": heure,
+                "types": [collecte["type_collecte"] for collecte in collectes],
+                "collectes": collectes,
+            },
+        )
+
+
+def _next_collection_day(schedule: Schedule, first: date) -> date | None:
+    """Retourner le premier jour de collecte (de type connu) à partir de ``first``."""
+    days = [
+        upcoming[0].date.date()
+        for collecte_type in COLLECTE_TYPES
+        if (upcoming := schedule.upcoming(first, collecte_type, 1))
+    ]
+    return min(days, default=None)
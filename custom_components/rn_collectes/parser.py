@@ -0,0 +1,189 @@
+"""Parsing des calendriers ICS de Rouyn-Noranda.
+
+Ces fonctions sont synchrones et coûteuses : elles sont exécutées dans
+l'exécuteur de Home Assistant, jamais sur la boucle d'événements.
+
+icalendar et recurring_ical_events ne sont importés qu'au premier calendrier
+que le lecteur rapide refuse : charger l'intégration ou ouvrir le flux de
+configuration ne paie pas leur coût d'importation.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+import logging
+from datetime import datetime, time, timedelta
+from time import perf_counter
+
+from .classifier import SummaryClassifier
+from .const import COLLECTE_TYPES, DEFAULT_WINDOW_DAYS, TIMEZONE
+from .scanner import SimpleEvent, UnsupportedFeature, scan_ics
+from .schedule import Schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+# Partagé par tous les parsings : la mémoire des résumés sert à tous les secteurs
+CLASSIFIER = SummaryClassifier(COLLECTE_TYPES)
+
+# Ligne d'événement : (instant, résumé, description, type de collecte)
+Row = tuple[float, str, str, "str | None"]
+
+
+class EventExpansion:
+    """Occurrences d'un calendrier ICS sur une fenêtre glissante.
+
+    Le calendrier est lu une seule fois ; quand la fenêtre avance d'un jour,
+    seules les occurrences passées sont retirées et la nouvelle fin est
+    calculée. Une nouvelle instance n'est nécessaire que si le contenu ICS
+    change.
+
+    Les calendriers simples sont lus par ``scan_ics`` ; les autres par
+    icalendar et recurring_ical_events.
+    """
+
+    __slots__ = ("_events", "_query", "_rows", "_classify_time", "start", "end", "timings")
+
+    def __init__(self, ics_content: bytes, use_scanner: bool = True) -> None:
+        """Lire le calendrier, sans encore calculer d'occurrences."""
+        start = perf_counter()
+        self._events: list[SimpleEvent] | None = None
+        self._query = None
+        if use_scanner:
+            try:
+                self._events = scan_ics(ics_content)
+            except (UnsupportedFeature, UnicodeDecodeError, ValueError) as err:
+                _LOGGER.debug("Lecture rapide impossible (%s), lecture complète", err)
+        if self._events is None:
+            self._query = _library_query(ics_content)
+        self._rows: list[Row] = []
+        self._classify_time = 0.0
+        self.start: datetime | None = None
+        self.end: datetime | None = None
+        # Durées (secondes) des étapes de la dernière opération
+        self.timings: dict[str, float] = {"parse": perf_counter() - start}
+
+    def slide(self, window_days: int = DEFAULT_WINDOW_DAYS) -> Schedule:
+        """Amener la fenêtre à ``window_days`` jours à partir d'aujourd'hui."""
+        start = datetime.now(TIMEZONE).replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=window_days)
+
+        began = perf_counter()
+        self._classify_time = 0.0
+        if self.start is None or not self.start <= start < self.end:
+            # Première expansion, ou fenêtre sans recouvrement avec la précédente
+            stage = "expand"
+            rows = self._expand(start, end)
+        else:
+            stage = "slide"
+            # Retirer le début passé et ajouter la nouvelle fin
+            first = bisect_left(self._rows, start.timestamp(), key=_timestamp)
+            last = bisect_left(self._rows, end.timestamp(), key=_timestamp)
+            rows = self._rows[first:last]
+            if end > self.end:
+                rows.extend(self._expand(self.end, end))
+
+        self._rows, self.start, self.end = rows, start, end
+        schedule = Schedule.build(rows, last_update=datetime.now())
+        self.timings = {
+            stage: perf_counter() - began - self._classify_time,
+            "classify": self._classify_time,
+        }
+        return schedule
+
+    @property
+    def scanned(self) -> bool:
+        """Indiquer si le calendrier a été lu par le lecteur rapide."""
+        return self._events is not None
+
+    def _expand(self, start: datetime, end: datetime) -> list[Row]:
+        """Calculer les occurrences qui commencent entre ``start`` (inclus) et ``end``."""
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+
+        if self._events is not None:
+            occurrences = self._scanned_occurrences(start, end)
+        else:
+            occurrences = self._library_occurrences(start, end)
+
+        rows = []
+        for timestamp, summary, description in occurrences:
+            # Une occurrence à cheval sur une borne n'appartient qu'à une fenêtre
+            if start_ts <= timestamp < end_ts:
+                classify_start = perf_counter()
+                collecte_type = CLASSIFIER.classify(summary)
+                self._classify_time += perf_counter() - classify_start
+                rows.append((timestamp, summary, description, collecte_type))
+
+        rows.sort(key=_timestamp)
+        return rows
+
+    def _scanned_occurrences(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[float, str, str]]:
+        """Énumérer les occurrences des événements lus par ``scan_ics``."""
+        tz = TIMEZONE
+        first, last = start.date(), end.date()
+        for event in self._events:
+            for day in event.occurrences(first, last):
+                yield (
+                    datetime.combine(day, time.min, tzinfo=tz).timestamp(),
+                    event.summary,
+                    event.description,
+                )
+
+    def _library_occurrences(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[float, str, str]]:
+        """Énumérer les occurrences calculées par recurring_ical_events."""
+        tz = TIMEZONE
+        for event in self._query.between(start, end):
+            dtstart = event.get('DTSTART').dt
+
+            # Convertir en datetime avec le fuseau horaire approprié
+            if isinstance(dtstart, datetime):
+                event_date = dtstart
+                if event_date.tzinfo is None:
+                    event_date = event_date.replace(tzinfo=tz)
+            else:
+                # Si c'est une date (sans heure), créer un datetime à minuit dans le fuseau horaire local
+                event_date = datetime.combine(dtstart, datetime.min.time()).replace(tzinfo=tz)
+
+            yield (
+                event_date.timestamp(),
+                str(event.get('SUMMARY', '')),
+                str(event.get('DESCRIPTION', '')),
+            )
+
+
+def _library_query(ics_content: bytes):
+    """Lire le calendrier avec icalendar et recurring_ical_events."""
+    # Importés ici, dans l'exécuteur : les modules restent ensuite en cache
+    from icalendar import Calendar  # pylint: disable=import-outside-toplevel
+    import recurring_ical_events  # pylint: disable=import-outside-toplevel
+
+    return recurring_ical_events.of(Calendar.from_ical(ics_content))
+
+
+def expand_ics(
+    ics_content: bytes, window_days: int = DEFAULT_WINDOW_DAYS
+) -> tuple[EventExpansion, Schedule]:
+    """Parser le contenu ICS et calculer la fenêtre initiale."""
+    try:
+        expansion = EventExpansion(ics_content)
+        parse_timings = expansion.timings
+        schedule = expansion.slide(window_days)
+        expansion.timings = parse_timings | expansion.timings
+        return expansion, schedule
+    except Exception as err:
+        _LOGGER.error("Erreur lors du parsing ICS: %s", err)
+        raise
+
+
+def parse_ics(ics_content: bytes, window_days: int = DEFAULT_WINDOW_DAYS) -> Schedule:
+    """Parser le contenu ICS."""
+    return expand_ics(ics_content, window_days)[1]
+
+
+def _timestamp(row: Row) -> float:
+    """Retourner l'instant d'une ligne d'événement."""
+    return row[0]
@@ -0,0 +1,47 @@
+"""Limite de débit des requêtes vers le portail de Rouyn-Noranda."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_TOKEN_BUCKET, REQUEST_BURST, REQUEST_RATE
+
+
+class TokenBucket:
+    """Seau à jetons : ``rate`` requêtes par seconde, rafales de ``capacity``.
+
+    Les appelants en attente sont servis dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialiser le seau, plein."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Ajouter les jetons accumulés depuis la dernière mise à jour."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def async_acquire(self) -> None:
+        """Attendre qu'un jeton soit disponible et le consommer."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+
+@callback
+def async_get_token_bucket(hass: HomeAssistant) -> TokenBucket:
+    """Retourner le seau à jetons partagé par toutes les entrées."""
+    if (bucket := hass.data.get(DATA_TOKEN_BUCKET)) is None:
+        bucket = hass.data[DATA_TOKEN_BUCKET] = TokenBucket(REQUEST_RATE, REQUEST_BURST)
+    return bucket
@@ -0,0 +1,71 @@
+"""Changement de jour local pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time
+
+from .const import DATA_DAY_ROLLOVER, SIGNAL_DAY_CHANGED, TIMEZONE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DayRollover:
+    """Jour local courant, avancé par une seule minuterie à minuit.
+
+    Les valeurs des capteurs ne dépendent que du calendrier et du jour : une
+    minuterie unique pour toute l'intégration annonce le changement de jour
+    (``SIGNAL_DAY_CHANGED``) au lieu que chaque lecture recalcule la date.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialiser avec le jour courant."""
+        self.hass = hass
+        self.today: date = datetime.now(TIMEZONE).date()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Démarrer la minuterie."""
+        if self._unsub is None:
+            self._schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Arrêter la minuterie."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _schedule(self) -> None:
+        """Planifier le prochain minuit local."""
+        midnight = datetime.combine(self.today + timedelta(days=1), time.min, tzinfo=TIMEZONE)
+        self._unsub = async_track_point_in_utc_time(self.hass, self._async_midnight, midnight)
+
+    @callback
+    def _async_midnight(self, now: datetime) -> None:
+        """Avancer le jour et prévenir les coordinateurs."""
+        self.today = now.astimezone(TIMEZONE).date()
+        _LOGGER.debug("Nouveau jour: %s", self.today)
+        self._schedule()
+        async_dispatcher_send(self.hass, SIGNAL_DAY_CHANGED)
+
+
+@callback
+def async_get_day_rollover(hass: HomeAssistant) -> DayRollover:
+    """Retourner la minuterie partagée, démarrée à la première demande."""
+    if (rollover := hass.data.get(DATA_DAY_ROLLOVER)) is None:
+        rollover = hass.data[DATA_DAY_ROLLOVER] = DayRollover(hass)
+        rollover.async_start()
+    return rollover
+
+
+@callback
+def async_stop_day_rollover(hass: HomeAssistant) -> None:
+    """Arrêter la minuterie partagée."""
+    if (rollover := hass.data.pop(DATA_DAY_ROLLOVER, None)) is not None:
+        rollover.async_stop()
@@ -0,0 +1,256 @@
+"""Lecture rapide des calendriers ICS simples.
+
+Le flux de la ville ne contient que des événements d'une journée, avec au
+plus une règle de récurrence quotidienne ou hebdomadaire. Pour ces fichiers,
+``scan_ics`` lit les lignes une à une et ne garde que DTSTART, SUMMARY,
+DESCRIPTION, RRULE et EXDATE, sans construire l'arbre d'objets d'icalendar
+ni passer par recurring_ical_events. Toute propriété ou valeur non prise en
+charge lève ``UnsupportedFeature`` : l'appelant se rabat alors sur les
+bibliothèques complètes.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+import re
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+# Propriétés sans effet sur les dates ni les textes retenus
+_IGNORED = frozenset(
+    {
+        "UID", "DTSTAMP", "DTEND", "DURATION", "CREATED", "LAST-MODIFIED",
+        "SEQUENCE", "LOCATION", "CATEGORIES", "TRANSP", "CLASS", "PRIORITY",
+        "URL", "ORGANIZER", "COMMENT", "CONTACT",
+    }
+)
+_CALENDAR_IGNORED = frozenset({"VERSION", "PRODID", "CALSCALE", "METHOD"})
+
+_DATE = re.compile(r"\d{8}")
+_UNESCAPE = re.compile(r"\\([\\;,nN])")
+
+
+class UnsupportedFeature(Exception):
+    """Le calendrier utilise une fonctionnalité que le lecteur rapide ignore."""
+
+
+@dataclass(slots=True)
+class SimpleEvent:
+    """Un VEVENT d'une journée, avec sa récurrence éventuelle."""
+
+    start: date
+    summary: str
+    description: str
+    freq: str | None = None
+    interval: int = 1
+    weekdays: tuple[int, ...] = ()
+    until: date | None = None
+    count: int | None = None
+    exdates: frozenset[date] = frozenset()
+
+    def occurrences(self, start: date, end: date) -> Iterator[date]:
+        """Retourner les occurrences entre ``start`` (inclus) et ``end`` (exclu)."""
+        for day in self._series(start):
+            if day >= end:
+                return
+            if day >= start and day not in self.exdates:
+                yield day
+
+    def _series(self, start: date) -> Iterator[date]:
+        """Énumérer la série dans l'ordre, en sautant ce qui précède ``start``.
+
+        Avec COUNT, la série est parcourue depuis le début : les occurrences
+        passées comptent.
+        """
+        if self.freq is None:
+            yield self.start
+            return
+
+        generated = 0
+        if self.freq == "DAILY":
+            step = timedelta(days=self.interval)
+            first = 0
+            if self.count is None and start > self.start:
+                first = (start - self.start).days // self.interval
+            day = self.start + step * first
+            while self.until is None or day <= self.until:
+                yield day
+                generated += 1
+                if self.count is not None and generated >= self.count:
+                    return
+                day += step
+            return
+
+        # Hebdomadaire : semaines commençant le lundi (WKST=MO)
+        week = self.start - timedelta(days=self.start.weekday())
+        step = timedelta(weeks=self.interval)
+        if self.count is None and start > week:
+            week += step * ((start - week).days // 7 // self.interval)
+        while True:
+            for weekday in self.weekdays:
+                day = week + timedelta(days=weekday)
+                if day < self.start:
+                    continue
+                if self.until is not None and day > self.until:
+                    return
+                yield day
+                generated += 1
+                if self.count is not None and generated >= self.count:
+                    return
+            week += step
+
+
+def scan_ics(ics_content: bytes) -> list[SimpleEvent]:
+    """Lire les VEVENT d'un calendrier simple."""
+    events: list[SimpleEvent] = []
+    properties: dict[str, tuple[str, str]] | None = None
+    exdates: list[date] = []
+    depth: list[str] = []
+
+    for line in _unfold(ics_content.decode("utf-8")):
+        name, params, value = _split(line)
+
+        if name == "BEGIN":
+            value = value.upper()
+            if value not in ("VCALENDAR", "VEVENT") or value in depth:
+                raise UnsupportedFeature(f"BEGIN:{value}")
+            depth.append(value)
+            if value == "VEVENT":
+                properties, exdates = {}, []
+            continue
+        if name == "END":
+            value = value.upper()
+            if not depth or depth.pop() != value:
+                raise UnsupportedFeature(f"END:{value}")
+            if value == "VEVENT":
+                events.append(_build_event(properties, exdates))
+                properties = None
+            continue
+
+        if properties is None:
+            # Propriétés du calendrier
+            if name not in _CALENDAR_IGNORED and not name.startswith("X-"):
+                raise UnsupportedFeature(name)
+        elif name == "EXDATE":
+            exdates.extend(_parse_dates(params, value))
+        elif name in ("DTSTART", "SUMMARY", "DESCRIPTION", "RRULE"):
+            if name in properties:
+                raise UnsupportedFeature(f"{name} en double")
+            properties[name] = (params, value)
+        elif name == "STATUS":
+            if value.upper() != "CONFIRMED":
+                raise UnsupportedFeature(f"STATUS:{value}")
+        elif name not in _IGNORED and not name.startswith("X-"):
+            raise UnsupportedFeature(name)
+
+    if depth:
+        raise UnsupportedFeature("calendrier incomplet")
+    return events
+
+
+def _unfold(text: str) -> Iterator[str]:
+    """Retourner les lignes logiques (lignes repliées réunies)."""
+    current: str | None = None
+    # Pas de splitlines() : il coupe aussi sur des séparateurs Unicode
+    # qui peuvent apparaître dans les textes
+    for line in text.split("\n"):
+        line = line.rstrip("\r")
+        if line[:1] in (" ", "\t"):
+            if current is None:
+                raise UnsupportedFeature("ligne de continuation orpheline")
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split(line: str) -> tuple[str, str, str]:
+    """Séparer le nom, les paramètres et la valeur d'une ligne de contenu."""
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            head, value = line[:index], line[index + 1:]
+            name, _, params = head.partition(";")
+            return name.upper(), params.upper(), value
+    raise UnsupportedFeature(f"ligne invalide: {line!r}")
+
+
+def _parse_date(params: str, value: str) -> date:
+    """Lire une valeur DATE (AAAAMMJJ)."""
+    if params not in ("", "VALUE=DATE") or not _DATE.fullmatch(value):
+        raise UnsupportedFeature(f"date non prise en charge: {params}:{value}")
+    return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+
+
+def _parse_dates(params: str, value: str) -> list[date]:
+    """Lire une liste de valeurs DATE séparées par des virgules."""
+    return [_parse_date(params, part) for part in value.split(",")]
+
+
+def _unescape(value: str) -> str:
+    """Décoder les séquences d'échappement d'une valeur TEXT."""
+    return _UNESCAPE.sub(
+        lambda match: "\n" if match.group(1) in "nN" else match.group(1), value
+    )
+
+
+def _build_event(properties: dict[str, tuple[str, str]], exdates: list[date]) -> SimpleEvent:
+    """Construire un événement à partir de ses propriétés."""
+    if "DTSTART" not in properties:
+        raise UnsupportedFeature("VEVENT sans DTSTART")
+    start = _parse_date(*properties["DTSTART"])
+    event = SimpleEvent(
+        start=start,
+        summary=_unescape(properties.get("SUMMARY", ("", ""))[1]),
+        description=_unescape(properties.get("DESCRIPTION", ("", ""))[1]),
+        exdates=frozenset(exdates),
+    )
+    if "RRULE" in properties:
+        _apply_rrule(event, properties["RRULE"][1])
+    return event
+
+
+def _apply_rrule(event: SimpleEvent, rrule: str) -> None:
+    """Appliquer une règle DAILY ou WEEKLY simple à l'événement."""
+    parts = {}
+    for part in rrule.upper().split(";"):
+        key, _, value = part.partition("=")
+        parts[key] = value
+
+    freq = parts.pop("FREQ", None)
+    if freq not in ("DAILY", "WEEKLY"):
+        raise UnsupportedFeature(f"FREQ={freq}")
+    event.freq = freq
+    if "INTERVAL" in parts:
+        event.interval = int(parts.pop("INTERVAL"))
+        if event.interval < 1:
+            raise UnsupportedFeature(f"INTERVAL={event.interval}")
+    if "UNTIL" in parts:
+        event.until = _parse_date("", parts.pop("UNTIL"))
+    if "COUNT" in parts:
+        event.count = int(parts.pop("COUNT"))
+    if parts.pop("WKST", "MO") != "MO":
+        raise UnsupportedFeature("WKST")
+
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise UnsupportedFeature("BYDAY hors WEEKLY")
+        try:
+            weekdays = {WEEKDAYS[day] for day in parts.pop("BYDAY").split(",")}
+        except KeyError as err:
+            raise UnsupportedFeature(f"BYDAY={err}") from err
+        # DTSTART hors de la règle : cas ambigu entre les implémentations
+        if event.start.weekday() not in weekdays:
+            raise UnsupportedFeature("DTSTART hors de BYDAY")
+        event.weekdays = tuple(sorted(weekdays))
+    elif freq == "WEEKLY":
+        event.weekdays = (event.start.weekday(),)
+
+    if parts:
+        raise UnsupportedFeature(f"RRULE: {', '.join(parts)}")
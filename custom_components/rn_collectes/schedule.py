@@ -0,0 +1,182 @@
+"""Représentation compacte du calendrier de collectes d'un secteur."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import date, datetime, time
+from typing import NamedTuple
+
+from .const import COLLECTE_TYPES, TIMEZONE
+
+
+class CollecteEvent(NamedTuple):
+    """Une collecte, reconstruite à la demande depuis le calendrier."""
+
+    date: datetime
+    summary: str
+    description: str
+
+
+class Schedule:
+    """Événements d'un calendrier, triés et stockés dans des tableaux.
+
+    Chaque événement occupe un instant (``array('d')``) et deux indices vers
+    une table de chaînes partagée : les résumés et descriptions, répétés à
+    chaque occurrence d'une récurrence, ne sont stockés qu'une fois. Les vues
+    par type de collecte sont des tableaux d'indices vers ce stockage unique.
+    """
+
+    __slots__ = (
+        "timestamps",
+        "summary_ids",
+        "description_ids",
+        "strings",
+        "by_type",
+        "last_update",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        timestamps: array,
+        summary_ids: array,
+        description_ids: array,
+        strings: list[str],
+        by_type: dict[str, array],
+        last_update: datetime | None = None,
+    ) -> None:
+        """Initialiser le calendrier à partir de tableaux déjà triés."""
+        self.timestamps = timestamps
+        self.summary_ids = summary_ids
+        self.description_ids = description_ids
+        self.strings = strings
+        self.by_type = by_type
+        self.last_update = last_update
+
+    @classmethod
+    def build(
+        cls,
+        rows: Iterable[tuple[float, str, str, str | None]],
+        last_update: datetime | None = None,
+    ) -> Schedule:
+        """Construire le calendrier depuis des lignes (instant, résumé, description, type)."""
+        strings: list[str] = []
+        string_ids: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            if (string_id := string_ids.get(value)) is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            return string_id
+
+        timestamps = array("d")
+        summary_ids = array("I")
+        description_ids = array("I")
+        by_type = {collecte_type: array("I") for collecte_type in COLLECTE_TYPES}
+
+        for index, (timestamp, summary, description, collecte_type) in enumerate(
+            sorted(rows, key=lambda row: row[0])
+        ):
+            timestamps.append(timestamp)
+            summary_ids.append(intern(summary))
+            description_ids.append(intern(description))
+            if collecte_type is not None:
+                by_type[collecte_type].append(index)
+
+        return cls(timestamps, summary_ids, description_ids, strings, by_type, last_update)
+
+    def with_last_update(self, last_update: datetime) -> Schedule:
+        """Retourner le même calendrier (tableaux partagés) avec une autre date de mise à jour."""
+        return Schedule(
+            self.timestamps,
+            self.summary_ids,
+            self.description_ids,
+            self.strings,
+            self.by_type,
+            last_update,
+        )
+
+    def __len__(self) -> int:
+        """Retourner le nombre d'événements."""
+        return len(self.timestamps)
+
+    def event(self, index: int) -> CollecteEvent:
+        """Reconstruire l'événement à la position ``index``."""
+        return CollecteEvent(
+            datetime.fromtimestamp(self.timestamps[index], TIMEZONE),
+            self.strings[self.summary_ids[index]],
+            self.strings[self.description_ids[index]],
+        )
+
+    def events(self, collecte_type: str | None = None) -> list[CollecteEvent]:
+        """Retourner les événements d'un type, ou tous les événements."""
+        if collecte_type is None:
+            return [self.event(index) for index in range(len(self.timestamps))]
+        return [self.event(index) for index in self.by_type.get(collecte_type, ())]
+
+    def has_type(self, collecte_type: str) -> bool:
+        """Indiquer si le calendrier contient des collectes de ce type."""
+        return bool(self.by_type.get(collecte_type))
+
+    def upcoming_position(self, day: date, collecte_type: str | None = None) -> int:
+        """Retourner la position du premier événement à partir du jour ``day``.
+
+        La position est relative à la vue du type demandé, ou au calendrier
+        complet si ``collecte_type`` est ``None``.
+        """
+        start = datetime.combine(day, time.min, tzinfo=TIMEZONE).timestamp()
+        if collecte_type is None:
+            return bisect_left(self.timestamps, start)
+        return bisect_left(
+            self.by_type.get(collecte_type, ()), start, key=self.timestamps.__getitem__
+        )
+
+    def upcoming(
+        self, day: date, collecte_type: str | None = None, count: int = 1
+    ) -> list[CollecteEvent]:
+        """Retourner les ``count`` prochains événements à partir du jour ``day``."""
+        start = self.upcoming_position(day, collecte_type)
+        if collecte_type is None:
+            return [
+                self.event(index)
+                for index in range(start, min(start + count, len(self.timestamps)))
+            ]
+        return [
+            self.event(index)
+            for index in self.by_type.get(collecte_type, ())[start:start + count]
+        ]
+
+    def window(self, start: float, end: float) -> range:
+        """Retourner les positions des événements entre deux instants (inclus)."""
+        first = bisect_left(self.timestamps, start)
+        return range(first, bisect_right(self.timestamps, end, lo=first))
+
+    def as_dict(self) -> dict[str, any]:
+        """Sérialiser le calendrier sous une forme compacte (JSON)."""
+        return {
+            "timestamps": self.timestamps.tolist(),
+            "summary_ids": self.summary_ids.tolist(),
+            "description_ids": self.description_ids.tolist(),
+            "strings": self.strings,
+            "by_type": {
+                collecte_type: indices.tolist()
+                for collecte_type, indices in self.by_type.items()
+            },
+            "last_update": self.last_update.isoformat() if self.last_update else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, any]) -> Schedule:
+        """Reconstruire un calendrier sérialisé par ``as_dict``."""
+        by_type = {collecte_type: array("I") for collecte_type in COLLECTE_TYPES}
+        for collecte_type, indices in data["by_type"].items():
+            by_type[collecte_type] = array("I", indices)
+        return cls(
+            array("d", data["timestamps"]),
+            array("I", data["summary_ids"]),
+            array("I", data["description_ids"]),
+            list(data["strings"]),
+            by_type,
+            datetime.fromisoformat(data["last_update"]) if data.get("last_update") else None,
+        )
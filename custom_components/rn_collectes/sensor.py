@@ -1,20 +1,24 @@
 """Capteurs pour Rouyn-Noranda Collectes."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.typing import StateType
 
 from .const import DOMAIN, COLLECTE_TYPES
+from .coordinator import EMPTY_SUMMARY, CollectesCoordinator
+from .entity import CollectesEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,15 +35,50 @@ async def async_setup_entry(
     for collecte_type in COLLECTE_TYPES:
         entities.append(CollecteSensor(coordinator, entry, collecte_type))
 
+    for description in DIAGNOSTIC_SENSORS:
+        entities.append(CollectesDiagnosticSensor(coordinator, entry, description))
+
     async_add_entities(entities)
 
 
-class CollecteSensor(CoordinatorEntity, SensorEntity):
+@dataclass(frozen=True, kw_only=True)
+class CollectesDiagnosticSensorDescription(SensorEntityDescription):
+    """Description d'un capteur de diagnostic."""
+
+    value_fn: Callable[[CollectesCoordinator], StateType]
+
+
+# Mesures de performance du coordinateur de l'entrée, désactivées par défaut.
+# Le coordinateur est partagé par les adresses du secteur : toutes affichent
+# la même valeur. Les mesures de toute l'intégration sont dans le
+# téléchargement des diagnostics.
+DIAGNOSTIC_SENSORS: tuple[CollectesDiagnosticSensorDescription, ...] = (
+    CollectesDiagnosticSensorDescription(
+        key="sector_refresh_duration",
+        name="Durée du rafraîchissement du secteur",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda coordinator: (
+            round(coordinator.last_refresh_duration * 1000, 1)
+            if coordinator.last_refresh_duration is not None
+            else None
+        ),
+    ),
+)
+
+
+class CollecteSensor(CollectesEntity, SensorEntity):
     """Capteur pour une collecte spécifique."""
 
+    # Attributs volumineux ou redondants, exclus de l'historique du recorder ;
+    # le service get_upcoming_collections les retourne à la demande
+    _unrecorded_attributes = frozenset(
+        {"description", "prochaines_collectes", "days_until", "derniere_mise_a_jour"}
+    )
+
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: CollectesCoordinator,
         entry: ConfigEntry,
         collecte_type: str,
     ) -> None:
@@ -65,74 +104,20 @@ class CollecteSensor(CoordinatorEntity, SensorEntity):
         }
         return icons.get(self.collecte_type, "mdi:calendar")
 
+    def _state_fingerprint(self) -> tuple:
+        """Retourner l'empreinte de l'état, sans la date de dernière mise à jour."""
+        summary = self.coordinator.summaries.get(self.collecte_type, EMPTY_SUMMARY)
+        return summary.native_value, summary.fingerprint
+
     @property
     def native_value(self) -> str | None:
         """Retourner la date de la prochaine collecte."""
-        if not self.coordinator.data:
-            return None
-
-        collectes = self.coordinator.data.get('collectes', {}).get(self.collecte_type, [])
-        
-        if not collectes:
-            return None
-
-        # Trouver la prochaine collecte (utiliser le fuseau horaire de Rouyn-Noranda)
-        tz = ZoneInfo("America/Toronto")
-        now = datetime.now(tz)
-        for collecte in collectes:
-            if collecte['date'] >= now:
-                return collecte['date'].strftime('%Y-%m-%d')
-
-        return None
+        return self.coordinator.summaries.get(self.collecte_type, EMPTY_SUMMARY).native_value
 
     @property
     def extra_state_attributes(self) -> dict[str, any]:
         """Retourner les attributs supplémentaires."""
-        if not self.coordinator.data:
-            return {}
-
-        collectes = self.coordinator.data.get('collectes', {}).get(self.collecte_type, [])
-        
-        if not collectes:
-            return {}
-
-        # Utiliser le fuseau horaire de Rouyn-Noranda
-        tz = ZoneInfo("America/Toronto")
-        now = datetime.now(tz)
-        next_collecte = None
-        jours_restants = None
-
-        # Trouver la prochaine collecte
-        for collecte in collectes:
-            if collecte['date'] >= now:
-                next_collecte = collecte
-                break
-
-        if next_collecte:
-            delta = next_collecte['date'] - now
-            jours_restants = delta.days
-
-        # Préparer la liste des prochaines collectes (max 5)
-        upcoming = []
-        count = 0
-        for collecte in collectes:
-            if collecte['date'] >= now and count < 5:
-                upcoming.append({
-                    'date': collecte['date'].strftime('%Y-%m-%d'),
-                    'summary': collecte['summary']
-                })
-                count += 1
-
-        return {
-            'type_collecte': self.collecte_type,
-            'jours_restants': jours_restants,
-            'prochaine_date': next_collecte['date'].strftime('%Y-%m-%d') if next_collecte else None,
-            'description': next_collecte['description'] if next_collecte else None,
-            'prochaines_collectes': upcoming,
-            'derniere_mise_a_jour': self.coordinator.data.get('last_update').isoformat() if self.coordinator.data.get('last_update') else None,
-            'integration': DOMAIN,
-            'days_until': jours_restants,
-        }
+        return self.coordinator.summaries.get(self.collecte_type, EMPTY_SUMMARY).attributes
 
     @property
     def device_info(self):
@@ -143,3 +128,45 @@ class CollecteSensor(CoordinatorEntity, SensorEntity):
             "manufacturer": "Ville de Rouyn-Noranda",
             "model": "Calendrier de collectes",
         }
+
+
+class CollectesDiagnosticSensor(CollectesEntity, SensorEntity):
+    """Capteur de diagnostic des performances."""
+
+    entity_description: CollectesDiagnosticSensorDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: CollectesCoordinator,
+        entry: ConfigEntry,
+        description: CollectesDiagnosticSensorDescription,
+    ) -> None:
+        """Initialiser le capteur."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._entry = entry
+        displayed_number = entry.data.get("displayed_number", entry.data.get("civic_number", ""))
+        self._attr_name = f"{displayed_number} - {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": entry.title,
+            "manufacturer": "Ville de Rouyn-Noranda",
+            "model": "Calendrier de collectes",
+        }
+
+    def _state_fingerprint(self) -> StateType:
+        """Retourner la valeur mesurée."""
+        return self.native_value
+
+    @property
+    def available(self) -> bool:
+        """Les mesures restent disponibles même si le rafraîchissement échoue."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Retourner la valeur mesurée."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,235 @@
+"""Services pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .collector import CollectesCollector
+from .const import (
+    COLLECTE_TYPES,
+    CONF_ADDRESSES,
+    CONF_CIVIC_NUMBER,
+    CONF_CONFIG_ENTRY_ID,
+    CONF_COUNT,
+    CONF_DISPLAYED_NUMBER,
+    CONF_STREET,
+    CONF_TYPE_COLLECTE,
+    DEFAULT_UPCOMING_COUNT,
+    DOMAIN,
+    IMPORT_WORKERS,
+    SERVICE_GET_UPCOMING_COLLECTIONS,
+    SERVICE_IMPORT_ADDRESSES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ADDRESS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_STREET): cv.string,
+        vol.Required(CONF_CIVIC_NUMBER): cv.string,
+        vol.Optional(CONF_DISPLAYED_NUMBER): cv.string,
+    }
+)
+
+IMPORT_ADDRESSES_SCHEMA = vol.Schema(
+    {vol.Required(CONF_ADDRESSES): vol.All(cv.ensure_list, [ADDRESS_SCHEMA])}
+)
+
+GET_UPCOMING_COLLECTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(CONF_TYPE_COLLECTE): vol.In(COLLECTE_TYPES),
+        vol.Optional(CONF_COUNT, default=DEFAULT_UPCOMING_COUNT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+async def async_import_addresses(
+    hass: HomeAssistant, addresses: list[dict[str, str]]
+) -> dict[str, list[str]]:
+    """Valider une liste d'adresses et créer les entrées correspondantes.
+
+    Les adresses sont résolues en secteurs par un nombre borné de tâches,
+    puis chaque calendrier de secteur distinct est téléchargé et parsé une
+    seule fois avant la création de toutes les entrées.
+    """
+    configured = {
+        (entry.data[CONF_STREET], entry.data[CONF_CIVIC_NUMBER])
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    result: dict[str, list[str]] = {
+        "created": [],
+        "already_configured": [],
+        "invalid": [],
+        "failed": [],
+    }
+
+    # Retirer les doublons et les adresses déjà configurées
+    pending: dict[tuple[str, str], dict[str, str]] = {}
+    for address in addresses:
+        key = (address[CONF_STREET], address[CONF_CIVIC_NUMBER])
+        if key in configured:
+            result["already_configured"].append(_label(address))
+        else:
+            pending.setdefault(key, address)
+
+    workers = asyncio.Semaphore(IMPORT_WORKERS)
+
+    async def _async_run(coro):
+        async with workers:
+            return await coro
+
+    # 1. Résoudre chaque adresse en secteur (un POST par adresse inconnue)
+    collectors = [
+        CollectesCollector(hass, street=street, civic_number=civic_number)
+        for street, civic_number in pending
+    ]
+    sectors = await asyncio.gather(
+        *(_async_run(collector.async_resolve_sector()) for collector in collectors),
+        return_exceptions=True,
+    )
+
+    # 2. Télécharger et parser chaque secteur distinct une seule fois
+    by_sector: dict[str, list[CollectesCollector]] = {}
+    for collector, sector in zip(collectors, sectors):
+        address = pending[(collector.street, collector.civic_number)]
+        if isinstance(sector, Exception):
+            _LOGGER.error("Impossible de résoudre %s: %s", _label(address), sector)
+            result["failed"].append(_label(address))
+        elif sector is None:
+            result["invalid"].append(_label(address))
+        else:
+            by_sector.setdefault(sector, []).append(collector)
+
+    schedules = await asyncio.gather(
+        *(_async_run(members[0].async_get_collectes()) for members in by_sector.values()),
+        return_exceptions=True,
+    )
+
+    # 3. Créer toutes les entrées valides en une seule passe
+    valid: list[dict[str, str]] = []
+    for members, schedule in zip(by_sector.values(), schedules):
+        labels = [
+            _label(pending[(collector.street, collector.civic_number)])
+            for collector in members
+        ]
+        if isinstance(schedule, Exception):
+            result["failed"].extend(labels)
+        elif not schedule:
+            result["invalid"].extend(labels)
+        else:
+            valid.extend(
+                pending[(collector.street, collector.civic_number)]
+                for collector in members
+            )
+
+    flows = await asyncio.gather(
+        *(
+            hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_IMPORT}, data=address
+            )
+            for address in valid
+        )
+    )
+    for address, flow in zip(valid, flows):
+        if flow["type"] == FlowResultType.CREATE_ENTRY:
+            result["created"].append(_label(address))
+        else:
+            result["already_configured"].append(_label(address))
+
+    _LOGGER.info(
+        "Importation terminée: %s créées, %s déjà configurées, %s invalides, %s en échec",
+        len(result["created"]),
+        len(result["already_configured"]),
+        len(result["invalid"]),
+        len(result["failed"]),
+    )
+    return result
+
+
+@callback
+def async_get_upcoming_collections(
+    hass: HomeAssistant,
+    entry_id: str,
+    collecte_type: str | None = None,
+    count: int = DEFAULT_UPCOMING_COUNT,
+) -> dict[str, list[dict[str, any]]]:
+    """Retourner les prochaines collectes d'une entrée, par type de collecte."""
+    if (coordinator := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+        raise ServiceValidationError(f"Entrée de configuration inconnue ou non chargée: {entry_id}")
+
+    schedule = coordinator.data
+    if not schedule:
+        return {}
+
+    today = coordinator.today
+    return {
+        type_collecte: [
+            {
+                "date": collecte.date.strftime('%Y-%m-%d'),
+                "jours_restants": (collecte.date.date() - today).days,
+                "summary": collecte.summary,
+                "description": collecte.description,
+            }
+            for collecte in schedule.upcoming(today, type_collecte, count)
+        ]
+        for type_collecte in ([collecte_type] if collecte_type else COLLECTE_TYPES)
+        if schedule.has_type(type_collecte)
+    }
+
+
+def _label(address: dict[str, str]) -> str:
+    """Retourner l'adresse sous une forme lisible."""
+    displayed_number = address.get(CONF_DISPLAYED_NUMBER, address[CONF_CIVIC_NUMBER])
+    return f"{displayed_number} {address[CONF_STREET]}"
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Enregistrer les services de l'intégration."""
+
+    async def _async_import_addresses(call: ServiceCall) -> ServiceResponse:
+        """Importer une liste d'adresses."""
+        return await async_import_addresses(hass, call.data[CONF_ADDRESSES])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_ADDRESSES,
+        _async_import_addresses,
+        schema=IMPORT_ADDRESSES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    @callback
+    def _async_get_upcoming_collections(call: ServiceCall) -> ServiceResponse:
+        """Retourner les prochaines collectes d'une adresse."""
+        return async_get_upcoming_collections(
+            hass,
+            call.data[CONF_CONFIG_ENTRY_ID],
+            call.data.get(CONF_TYPE_COLLECTE),
+            call.data[CONF_COUNT],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_UPCOMING_COLLECTIONS,
+        _async_get_upcoming_collections,
+        schema=GET_UPCOMING_COLLECTIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,196 @@
+"""Stockage persistant pour Rouyn-Noranda Collectes."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .cache import SectorEntry
+from .const import (
+    ADDRESS_RESOLUTION_MAX_AGE,
+    ADDRESS_STORAGE_KEY,
+    DATA_ADDRESS_STORE,
+    DATA_SCHEDULE_STORE,
+    SCHEDULE_STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .schedule import Schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AddressStore:
+    """Résolutions adresse → URL du calendrier .ics.
+
+    L'URL du calendrier d'une adresse ne change presque jamais : on la garde
+    sur disque pour éviter de soumettre le formulaire du portail à chaque
+    rafraîchissement et au démarrage.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialiser le stockage."""
+        self._store: Store[dict[str, any]] = Store(
+            hass, STORAGE_VERSION, ADDRESS_STORAGE_KEY
+        )
+        self._addresses: dict[str, dict[str, str]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Charger les résolutions depuis le disque (une seule fois)."""
+        async with self._load_lock:
+            if self._addresses is not None:
+                return
+            data = await self._store.async_load() or {}
+            self._addresses = data.get("addresses", {})
+
+    @staticmethod
+    def _key(street: str, civic_number: str) -> str:
+        """Construire la clé d'une adresse."""
+        return f"{street}|{civic_number}"
+
+    def get(self, street: str, civic_number: str) -> dict[str, str] | None:
+        """Retourner la résolution connue d'une adresse."""
+        return self._addresses.get(self._key(street, civic_number))
+
+    @staticmethod
+    def is_stale(record: dict[str, str]) -> bool:
+        """Indiquer si une résolution doit être revérifiée auprès du portail."""
+        resolved_at = dt_util.parse_datetime(record.get("resolved_at", ""))
+        if resolved_at is None:
+            return True
+        return dt_util.utcnow() - resolved_at > ADDRESS_RESOLUTION_MAX_AGE
+
+    @callback
+    def async_set(self, street: str, civic_number: str, ics_url: str) -> None:
+        """Mémoriser la résolution d'une adresse."""
+        self._addresses[self._key(street, civic_number)] = {
+            "ics_url": ics_url,
+            "resolved_at": dt_util.utcnow().isoformat(),
+        }
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, street: str, civic_number: str) -> None:
+        """Oublier la résolution d'une adresse."""
+        if self._addresses.pop(self._key(street, civic_number), None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove_url(self, ics_url: str) -> None:
+        """Oublier toutes les adresses résolues vers un calendrier."""
+        keys = [key for key, record in self._addresses.items() if record["ics_url"] == ics_url]
+        for key in keys:
+            del self._addresses[key]
+        if keys:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, any]:
+        """Retourner les données à écrire sur le disque."""
+        return {"addresses": self._addresses}
+
+
+async def async_get_address_store(hass: HomeAssistant) -> AddressStore:
+    """Retourner le stockage des adresses, chargé depuis le disque."""
+    if (store := hass.data.get(DATA_ADDRESS_STORE)) is None:
+        store = hass.data[DATA_ADDRESS_STORE] = AddressStore(hass)
+    await store.async_load()
+    return store
+
+
+class ScheduleStore:
+    """Derniers calendriers parsés de chaque secteur.
+
+    Au démarrage, les entités affichent immédiatement le dernier calendrier
+    connu ; le rafraîchissement réseau se fait ensuite en arrière-plan. Les
+    validateurs HTTP et l'empreinte du contenu sont conservés pour que ce
+    premier rafraîchissement soit une requête conditionnelle.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialiser le stockage."""
+        self._store: Store[dict[str, any]] = Store(
+            hass, STORAGE_VERSION, SCHEDULE_STORAGE_KEY
+        )
+        # Enregistrements lus sur le disque, convertis à la première demande
+        self._records: dict[str, dict[str, any]] | None = None
+        self._entries: dict[str, SectorEntry] = {}
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Charger les calendriers depuis le disque (une seule fois)."""
+        async with self._load_lock:
+            if self._records is not None:
+                return
+            data = await self._store.async_load() or {}
+            self._records = data.get("sectors", {})
+
+    def get(self, sector: str) -> SectorEntry | None:
+        """Retourner le dernier calendrier connu d'un secteur."""
+        if (entry := self._entries.get(sector)) is not None:
+            return entry
+        if (record := self._records.pop(sector, None)) is None:
+            return None
+        try:
+            entry = SectorEntry(
+                content=None,
+                data=Schedule.from_dict(record["schedule"]),
+                fetched_at=dt_util.parse_datetime(record["fetched_at"]),
+                etag=record.get("etag"),
+                last_modified=record.get("last_modified"),
+                digest=record.get("digest"),
+                parsed_on=dt_util.parse_date(record["parsed_on"]) if record.get("parsed_on") else None,
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Calendrier enregistré invalide pour le secteur %s: %s", sector, err)
+            return None
+        self._entries[sector] = entry
+        return entry
+
+    @callback
+    def async_set(self, sector: str, entry: SectorEntry) -> None:
+        """Mémoriser le calendrier d'un secteur."""
+        self._records.pop(sector, None)
+        self._entries[sector] = entry
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, sector: str) -> None:
+        """Oublier le calendrier d'un secteur."""
+        if (
+            self._records.pop(sector, None) is not None
+            or self._entries.pop(sector, None) is not None
+        ):
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @staticmethod
+    def _serialize(entry: SectorEntry) -> dict[str, any]:
+        """Sérialiser une entrée de secteur, sans son contenu brut."""
+        return {
+            "schedule": entry.data.as_dict(),
+            "fetched_at": entry.fetched_at.isoformat(),
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "digest": entry.digest,
+            "parsed_on": entry.parsed_on.isoformat() if entry.parsed_on else None,
+        }
+
+    @callback
+    def _data_to_save(self) -> dict[str, any]:
+        """Retourner les données à écrire sur le disque."""
+        sectors = dict(self._records)
+        for sector, entry in self._entries.items():
+            sectors[sector] = self._serialize(entry)
+        return {"sectors": sectors}
+
+
+async def async_get_schedule_store(hass: HomeAssistant) -> ScheduleStore:
+    """Retourner le stockage des calendriers, chargé depuis le disque."""
+    if (store := hass.data.get(DATA_SCHEDULE_STORE)) is None:
+        store = hass.data[DATA_SCHEDULE_STORE] = ScheduleStore(hass)
+    await store.async_load()
+    return store
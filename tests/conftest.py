@@ -0,0 +1,125 @@
+"""Fixtures communes aux tests."""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import AsyncGenerator
+import hashlib
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.rn_collectes import collector
+from custom_components.rn_collectes.const import DOMAIN
+
+pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+# Calendrier servi pour chaque secteur : déchets et récupération en
+# alternance le lundi, encombrants le samedi 7 novembre 2026
+CALENDAR = (
+    "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//tests//FR\r\n"
+    "BEGIN:VEVENT\r\nUID:1\r\nDTSTART;VALUE=DATE:20260105\r\n"
+    "SUMMARY:Collecte des Déchets\r\nDESCRIPTION:Bac noir\r\n"
+    "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:2\r\nDTSTART;VALUE=DATE:20260112\r\n"
+    "SUMMARY:Récupération\r\nDESCRIPTION:Bac bleu\r\n"
+    "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:3\r\nDTSTART;VALUE=DATE:20261107\r\n"
+    "SUMMARY:Encombrants\r\nEND:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+).encode()
+
+STREETS = ("Rue A", "Rue B")
+CIVIC_NUMBERS = ("101", "103", "999")
+
+
+class Portal:
+    """Serveur local qui imite le portail citoyen de Rouyn-Noranda.
+
+    Le numéro civique 999 est dans le secteur 46, les autres dans le 45.
+    ``requests`` compte les requêtes reçues par type.
+    """
+
+    def __init__(self) -> None:
+        """Initialiser les compteurs."""
+        self.requests: Counter[str] = Counter()
+        self.etag = f'"{hashlib.sha256(CALENDAR).hexdigest()[:16]}"'
+
+    def make_app(self) -> web.Application:
+        """Créer l'application du portail."""
+        app = web.Application()
+        app.router.add_get("/calendrier-de-collectes", self._page)
+        app.router.add_post("/calendrier-de-collectes", self._ajax)
+        app.router.add_get("/avis/collectes/calendrier.ics", self._calendar)
+        return app
+
+    async def _page(self, request: web.Request) -> web.Response:
+        """Page du calendrier, avec la liste des rues."""
+        self.requests["streets"] += 1
+        options = "".join(f'<option value="{street}">{street}</option>' for street in STREETS)
+        return web.Response(
+            text=f'<html><select><option value="">--</option>{options}</select></html>',
+            content_type="text/html",
+        )
+
+    async def _ajax(self, request: web.Request) -> web.Response:
+        """Gestionnaires OctoberCMS : numéros civiques et calendrier d'une adresse."""
+        data = await request.post()
+        if request.headers.get("X-OCTOBER-REQUEST-HANDLER") == "addressPicker::onChangeStreet":
+            self.requests["civic_numbers"] += 1
+            options = "".join(f'<option value="{civic}">{civic}</option>' for civic in CIVIC_NUMBERS)
+            return web.json_response(
+                {"addressPicker::dropdown_civic": f'<option value="">Saisir un no. civique</option>{options}'}
+            )
+
+        self.requests["resolve"] += 1
+        sector = "46" if data.get("addresses_civic") == "999" else "45"
+        return web.json_response(
+            {
+                "avisComposanteCollectes0::schedule": (
+                    "<p>https://citoyen.rouyn-noranda.ca/avis/collectes/"
+                    f"calendrier.ics?secteurs={sector}</p>"
+                )
+            }
+        )
+
+    async def _calendar(self, request: web.Request) -> web.Response:
+        """Fichier ICS d'un secteur, avec ETag et 304."""
+        if request.headers.get("If-None-Match") == self.etag:
+            self.requests["calendar_304"] += 1
+            return web.Response(status=304, headers={"ETag": self.etag})
+        self.requests["calendar"] += 1
+        return web.Response(
+            body=CALENDAR, headers={"ETag": self.etag, "Content-Type": "text/calendar"}
+        )
+
+
+def add_address_entry(hass: HomeAssistant, civic_number: str) -> MockConfigEntry:
+    """Ajouter l'entrée d'une adresse de la rue A."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Collectes au {civic_number} Rue A",
+        data={"street": "Rue A", "civic_number": civic_number, "displayed_number": civic_number},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Charger l'intégration depuis custom_components."""
+    yield
+
+
+@pytest.fixture
+async def portal(socket_enabled, monkeypatch) -> AsyncGenerator[Portal, None]:
+    """Démarrer le portail local et y diriger le collecteur."""
+    portal = Portal()
+    server = TestServer(portal.make_app())
+    await server.start_server()
+    monkeypatch.setattr(collector, "BASE_URL", f"http://127.0.0.1:{server.port}")
+    yield portal
+    await server.close()
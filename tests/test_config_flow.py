@@ -0,0 +1,47 @@
+"""Tests du flux d'options."""
+from __future__ import annotations
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.setup import async_setup_component
+
+from custom_components.rn_collectes.const import (
+    CONF_LEAD_DAYS,
+    CONF_NOTIFICATION_TIME,
+    DOMAIN,
+)
+
+from .conftest import Portal, add_address_entry
+
+
+async def test_options_flow(hass: HomeAssistant, portal: Portal) -> None:
+    """Le flux propose la veille à 18:00 et enregistre les délais en entiers triés."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    entry = add_address_entry(hass, "101")
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+    assert result["data_schema"]({}) == {
+        CONF_LEAD_DAYS: ["1"],
+        CONF_NOTIFICATION_TIME: "18:00:00",
+    }
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_LEAD_DAYS: ["2", "0"], CONF_NOTIFICATION_TIME: "07:00:00"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options == {CONF_LEAD_DAYS: [0, 2], CONF_NOTIFICATION_TIME: "07:00:00"}
+    assert entry.state is ConfigEntryState.LOADED
+
+    # Les options enregistrées deviennent les valeurs proposées
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["data_schema"]({}) == {
+        CONF_LEAD_DAYS: ["0", "2"],
+        CONF_NOTIFICATION_TIME: "07:00:00",
+    }
@@ -0,0 +1,133 @@
+"""Tests des coordinateurs partagés par secteur."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.rn_collectes.collector import CollectesCollector
+from custom_components.rn_collectes.const import DOMAIN, SECTOR_CACHE_TTL, TIMEZONE
+from custom_components.rn_collectes.coordinator import async_get_sector_coordinators
+
+from .conftest import Portal, add_address_entry
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=TIMEZONE)
+
+
+async def _setup_entries(hass: HomeAssistant, *civic_numbers: str) -> list[MockConfigEntry]:
+    """Configurer les entrées de plusieurs adresses en même temps."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    entries = [add_address_entry(hass, civic_number) for civic_number in civic_numbers]
+    results = await asyncio.gather(
+        *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+    )
+    await hass.async_block_till_done()
+    assert all(results)
+    return entries
+
+
+async def test_entries_of_a_sector_share_one_coordinator(
+    hass: HomeAssistant, portal: Portal, freezer
+) -> None:
+    """Les adresses d'un secteur partagent un coordinateur et un téléchargement."""
+    freezer.move_to(NOW)
+    first, second, other = await _setup_entries(hass, "101", "103", "999")
+
+    coordinators = hass.data[DOMAIN]
+    assert coordinators[first.entry_id] is coordinators[second.entry_id]
+    assert coordinators[first.entry_id] is not coordinators[other.entry_id]
+    assert async_get_sector_coordinators(hass).as_dict() == {"coordinators": 2, "entries": 3}
+    # Un calendrier par secteur, pas par adresse
+    assert portal.requests["calendar"] == 2
+
+    state = hass.states.get("sensor.101_dechets")
+    assert state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE)
+    assert hass.states.get("sensor.103_dechets").state == state.state
+
+
+async def test_one_refresh_per_sector(hass: HomeAssistant, portal: Portal, freezer) -> None:
+    """Les rafraîchissements simultanés des entrées d'un secteur font une seule requête."""
+    freezer.move_to(NOW)
+    first, second = await _setup_entries(hass, "101", "103")
+    before = portal.requests["calendar"] + portal.requests["calendar_304"]
+
+    # Calendrier en cache encore frais : aucune requête
+    await hass.data[DOMAIN][first.entry_id].async_refresh()
+    assert portal.requests["calendar"] + portal.requests["calendar_304"] == before
+
+    freezer.tick(SECTOR_CACHE_TTL + timedelta(minutes=1))
+    await asyncio.gather(
+        *(hass.data[DOMAIN][entry.entry_id].async_refresh() for entry in (first, second))
+    )
+
+    assert hass.data[DOMAIN][second.entry_id].last_update_success
+    assert portal.requests["calendar"] + portal.requests["calendar_304"] == before + 1
+
+
+async def test_last_entry_stops_the_coordinator(
+    hass: HomeAssistant, portal: Portal, freezer
+) -> None:
+    """Le coordinateur continue pour les autres entrées et s'arrête avec la dernière."""
+    freezer.move_to(NOW)
+    first, second = await _setup_entries(hass, "101", "103")
+    coordinators = async_get_sector_coordinators(hass)
+    coordinator = hass.data[DOMAIN][second.entry_id]
+
+    # L'entrée qui a créé le coordinateur n'en est pas propriétaire
+    assert await hass.config_entries.async_unload(first.entry_id)
+    assert coordinators.as_dict() == {"coordinators": 1, "entries": 1}
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert hass.states.get("sensor.103_dechets").state not in (STATE_UNKNOWN, STATE_UNAVAILABLE)
+
+    assert await hass.config_entries.async_unload(second.entry_id)
+    assert coordinators.as_dict() == {"coordinators": 0, "entries": 0}
+
+    # Une nouvelle configuration crée un nouveau coordinateur
+    assert await hass.config_entries.async_setup(first.entry_id)
+    assert coordinators.as_dict() == {"coordinators": 1, "entries": 1}
+    assert hass.data[DOMAIN][first.entry_id] is not coordinator
+
+
+async def test_reload_does_not_leak_stop_listeners(
+    hass: HomeAssistant, portal: Portal, freezer
+) -> None:
+    """Recharger une entrée ne laisse pas d'écouteur d'arrêt derrière elle."""
+    freezer.move_to(NOW)
+    (entry,) = await _setup_entries(hass, "101")
+    listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0)
+
+    for _ in range(3):
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0) == listeners
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0) < listeners
+
+
+async def test_failed_first_refresh_releases_entries(
+    hass: HomeAssistant, portal: Portal, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Un premier rafraîchissement en échec rend la référence de chaque entrée."""
+
+    async def _unavailable(self: CollectesCollector, ics_url: str) -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("portail indisponible")
+
+    monkeypatch.setattr(CollectesCollector, "async_get_sector_collectes", _unavailable)
+    assert await async_setup_component(hass, DOMAIN, {})
+    entries = [add_address_entry(hass, civic_number) for civic_number in ("101", "103")]
+
+    await asyncio.gather(*(hass.config_entries.async_setup(entry.entry_id) for entry in entries))
+
+    assert all(entry.state is ConfigEntryState.SETUP_RETRY for entry in entries)
+    assert async_get_sector_coordinators(hass).as_dict() == {"coordinators": 0, "entries": 0}
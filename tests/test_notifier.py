@@ -0,0 +1,249 @@
+"""Tests des événements de collectes à venir (``notifier.py``)."""
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import shutil
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+
+from custom_components.rn_collectes.const import (
+    CONF_LEAD_DAYS,
+    CONF_NOTIFICATION_TIME,
+    DOMAIN,
+    EVENT_UPCOMING_COLLECTION,
+    TIMEZONE,
+)
+from custom_components.rn_collectes.notifier import (
+    _requested_reminders,
+    async_get_automation_reminders,
+)
+
+from .conftest import Portal, add_address_entry
+
+BLUEPRINT = (
+    Path(__file__).parent.parent
+    / "blueprints/automation/rn_collectes/notification_collecte.yaml"
+)
+
+
+async def _setup_entry(hass: HomeAssistant, freezer, *at: int) -> MockConfigEntry:
+    """Configurer l'adresse 101 au moment donné (jour, heure, minute d'octobre 2026)."""
+    _move_to(freezer, *at)
+    assert await async_setup_component(hass, DOMAIN, {})
+    entry = add_address_entry(hass, "101")
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _move_to(freezer, day: int, hour: int, minute: int = 0) -> None:
+    """Avancer l'horloge à une heure locale d'octobre 2026."""
+    freezer.move_to(datetime(2026, 10, day, hour, minute, tzinfo=TIMEZONE))
+
+
+async def _advance(hass: HomeAssistant, freezer, *at: int) -> None:
+    """Avancer l'horloge et exécuter les minuteries échues."""
+    _move_to(freezer, *at)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def _fired(events) -> list[tuple[str, int, str]]:
+    """Retourner le jour, le délai et l'heure des événements émis."""
+    return [(event.data["date"], event.data["jours_restants"], event.data["heure"]) for event in events]
+
+
+async def test_default_reminder_the_day_before(
+    hass: HomeAssistant, portal: Portal, freezer
+) -> None:
+    """Sans option, l'événement part la veille de la collecte à 18:00."""
+    entry = await _setup_entry(hass, freezer, 18, 9)
+    events = async_capture_events(hass, EVENT_UPCOMING_COLLECTION)
+
+    await _advance(hass, freezer, 18, 17, 59)
+    assert not events
+
+    await _advance(hass, freezer, 18, 18, 0)
+    assert _fired(events) == [("2026-10-19", 1, "18:00:00")]
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+    assert events[0].data["config_entry_id"] == entry.entry_id
+    assert events[0].data["device_id"] == device.id
+    assert events[0].data["types"] == ["Récupération"]
+    assert events[0].data["collectes"][0]["description"] == "Bac bleu"
+
+    # Une seule fois par jour de collecte
+    await _advance(hass, freezer, 18, 23)
+    assert len(events) == 1
+
+
+async def test_options_apply_without_reload(
+    hass: HomeAssistant, portal: Portal, freezer
+) -> None:
+    """De nouveaux délais et une nouvelle heure replanifient sans recharger l'entrée."""
+    entry = await _setup_entry(hass, freezer, 18, 9)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    events = async_capture_events(hass, EVENT_UPCOMING_COLLECTION)
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_LEAD_DAYS: [0, 2], CONF_NOTIFICATION_TIME: "07:00:00"}
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+
+    for day in range(19, 25):
+        await _advance(hass, freezer, day, 6)
+        await _advance(hass, freezer, day, 7)
+    assert _fired(events) == [("2026-10-19", 0, "07:00:00"), ("2026-10-26", 2, "07:00:00")]
+
+
+async def test_no_lead_days_no_event(hass: HomeAssistant, portal: Portal, freezer) -> None:
+    """Aucun délai sélectionné : aucun événement."""
+    entry = await _setup_entry(hass, freezer, 18, 9)
+    events = async_capture_events(hass, EVENT_UPCOMING_COLLECTION)
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_LEAD_DAYS: [], CONF_NOTIFICATION_TIME: "18:00:00"}
+    )
+    await hass.async_block_till_done()
+    await _advance(hass, freezer, 18, 18)
+    await _advance(hass, freezer, 19, 18)
+
+    assert not events
+
+
+async def test_blueprint_automation_reminder(
+    hass: HomeAssistant, portal: Portal, freezer
+) -> None:
+    """Une automatisation du blueprint reçoit l'événement à son délai et à son heure."""
+    destination = Path(hass.config.path("blueprints/automation/rn_collectes"))
+    destination.mkdir(parents=True, exist_ok=True)
+    shutil.copy(BLUEPRINT, destination)
+
+    entry = await _setup_entry(hass, freezer, 18, 6)
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+    phone_entry = MockConfigEntry(domain="mobile_app")
+    phone_entry.add_to_hass(hass)
+    phone = device_registry.async_get_or_create(
+        config_entry_id=phone_entry.entry_id, identifiers={("mobile_app", "phone")}, name="Phone"
+    )
+    calls = async_mock_service(hass, "notify", "mobile_app_phone")
+    events = async_capture_events(hass, EVENT_UPCOMING_COLLECTION)
+
+    # Automatisation chargée après l'entrée : 2 jours avant, à 07:00
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": {
+                "use_blueprint": {
+                    "path": "rn_collectes/notification_collecte.yaml",
+                    "input": {
+                        "collecte_address": device.id,
+                        "notification_time": "07:00:00",
+                        "days_before": 2.0,
+                        "notify_devices": [phone.id],
+                    },
+                }
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    assert async_get_automation_reminders(hass).by_device == {
+        device.id: frozenset({(2, "07:00:00")})
+    }
+
+    for at in ((18, 7), (18, 18), (24, 6), (24, 7)):
+        await _advance(hass, freezer, *at)
+
+    # Le rappel des options de l'entrée et celui de l'automatisation ; seul
+    # le second correspond au filtre de l'automatisation
+    assert _fired(events) == [("2026-10-19", 1, "18:00:00"), ("2026-10-26", 2, "07:00:00")]
+    assert len(calls) == 1
+    assert "dans 2 jours" in calls[0].data["message"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not async_get_automation_reminders(hass)._unsubs
+
+
+@pytest.mark.parametrize(
+    ("raw_config", "expected"),
+    [
+        (
+            {
+                "trigger": [
+                    {
+                        "platform": "event",
+                        "event_type": EVENT_UPCOMING_COLLECTION,
+                        "event_data": {"device_id": "abc", "jours_restants": 1.0, "heure": "19:00:00"},
+                    }
+                ]
+            },
+            [("abc", 1, "19:00:00")],
+        ),
+        (
+            {
+                "triggers": {
+                    "trigger": "event",
+                    "event_type": [EVENT_UPCOMING_COLLECTION],
+                    "event_data": {"device_id": "abc", "jours_restants": 0, "heure": "07:30"},
+                }
+            },
+            [("abc", 0, "07:30")],
+        ),
+        # Délai hors limites, non entier, heure invalide, autre événement
+        (
+            {
+                "trigger": [
+                    {
+                        "platform": "event",
+                        "event_type": EVENT_UPCOMING_COLLECTION,
+                        "event_data": {"device_id": "abc", "jours_restants": 8, "heure": "07:00:00"},
+                    },
+                    {
+                        "platform": "event",
+                        "event_type": EVENT_UPCOMING_COLLECTION,
+                        "event_data": {"device_id": "abc", "jours_restants": 1.5, "heure": "07:00:00"},
+                    },
+                    {
+                        "platform": "event",
+                        "event_type": EVENT_UPCOMING_COLLECTION,
+                        "event_data": {"device_id": "abc", "jours_restants": 1, "heure": "soir"},
+                    },
+                    {
+                        "platform": "event",
+                        "event_type": "autre_evenement",
+                        "event_data": {"device_id": "abc", "jours_restants": 1, "heure": "07:00:00"},
+                    },
+                ]
+            },
+            [],
+        ),
+        # Déclencheur sans heure (automatisation écrite à la main)
+        (
+            {
+                "trigger": {
+                    "platform": "event",
+                    "event_type": EVENT_UPCOMING_COLLECTION,
+                    "event_data": {"device_id": "abc", "jours_restants": 1},
+                }
+            },
+            [],
+        ),
+    ],
+)
+def test_requested_reminders(raw_config: dict, expected: list) -> None:
+    """Seuls les déclencheurs complets et valides demandent un rappel."""
+    assert list(_requested_reminders(raw_config)) == expected
@@ -0,0 +1,99 @@
+"""Tests de la fenêtre glissante de ``EventExpansion``."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.rn_collectes.const import TIMEZONE
+from custom_components.rn_collectes.parser import EventExpansion
+from custom_components.rn_collectes.schedule import Schedule
+
+CALENDAR = (
+    "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//tests//FR\r\n"
+    "BEGIN:VEVENT\r\nUID:1\r\nDTSTART;VALUE=DATE:20260105\r\n"
+    "SUMMARY:Collecte des Déchets\r\nDESCRIPTION:Bac noir\r\n"
+    "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:2\r\nDTSTART;VALUE=DATE:20260112\r\n"
+    "SUMMARY:Récupération\r\nDESCRIPTION:Bac bleu\r\n"
+    "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:3\r\nDTSTART;VALUE=DATE:20260605\r\n"
+    "SUMMARY:Compost\r\nRRULE:FREQ=WEEKLY;BYDAY=FR;UNTIL=20261120\r\nEND:VEVENT\r\n"
+    "BEGIN:VEVENT\r\nUID:4\r\nDTSTART;VALUE=DATE:20261107\r\n"
+    "SUMMARY:Encombrants\r\nEND:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+).encode()
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=TIMEZONE)
+
+
+def _rows(schedule: Schedule) -> list[tuple]:
+    """Retourner les occurrences d'un calendrier sous une forme comparable."""
+    types = {
+        index: collecte_type
+        for collecte_type, indices in schedule.by_type.items()
+        for index in indices
+    }
+    return [
+        (event.date, event.summary, event.description, types.get(index))
+        for index, event in enumerate(schedule.events())
+    ]
+
+
+@pytest.mark.parametrize("use_scanner", [True, False])
+@pytest.mark.parametrize("days", [1, 3, 29])
+def test_slide_matches_new_expansion(freezer, use_scanner: bool, days: int) -> None:
+    """Une fenêtre avancée donne les mêmes occurrences qu'une nouvelle expansion."""
+    freezer.move_to(NOW)
+    expansion = EventExpansion(CALENDAR, use_scanner)
+    expansion.slide(30)
+
+    freezer.move_to(NOW + timedelta(days=days))
+    slid = expansion.slide(30)
+
+    assert "slide" in expansion.timings
+    assert _rows(slid) == _rows(EventExpansion(CALENDAR, use_scanner).slide(30))
+
+
+@pytest.mark.parametrize("use_scanner", [True, False])
+def test_slide_bounds(freezer, use_scanner: bool) -> None:
+    """La fenêtre commence à minuit et exclut sa fin."""
+    freezer.move_to(NOW)
+    expansion = EventExpansion(CALENDAR, use_scanner)
+    expansion.slide(30)
+
+    # Lundi 2026-10-19 : jour de collecte, en début de fenêtre
+    freezer.move_to(datetime(2026, 10, 19, 23, 0, tzinfo=TIMEZONE))
+    events = expansion.slide(14).events()
+
+    assert expansion.start == datetime(2026, 10, 19, tzinfo=TIMEZONE)
+    assert expansion.end == datetime(2026, 11, 2, tzinfo=TIMEZONE)
+    assert events[0].date == expansion.start
+    # Le lundi 2 novembre tombe sur la fin de la fenêtre
+    assert all(event.date < expansion.end for event in events)
+    assert [event.date.day for event in events] == [19, 23, 26, 30]
+
+
+def test_slide_without_overlap_expands_again(freezer) -> None:
+    """Une fenêtre qui ne recouvre plus la précédente est recalculée entièrement."""
+    freezer.move_to(NOW)
+    expansion = EventExpansion(CALENDAR)
+    expansion.slide(7)
+
+    freezer.move_to(NOW + timedelta(days=10))
+    schedule = expansion.slide(7)
+
+    assert "expand" in expansion.timings
+    assert _rows(schedule) == _rows(EventExpansion(CALENDAR).slide(7))
+
+
+def test_slide_shrinks_window(freezer) -> None:
+    """Une fenêtre plus courte retire les occurrences au-delà de sa fin."""
+    freezer.move_to(NOW)
+    expansion = EventExpansion(CALENDAR)
+    expansion.slide(60)
+
+    schedule = expansion.slide(7)
+
+    assert "slide" in expansion.timings
+    assert _rows(schedule) == _rows(EventExpansion(CALENDAR).slide(7))
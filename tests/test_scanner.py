@@ -0,0 +1,135 @@
+"""Tests du lecteur rapide (``scanner.py``) contre icalendar + recurring_ical_events."""
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+
+from custom_components.rn_collectes.const import TIMEZONE
+from custom_components.rn_collectes.parser import EventExpansion
+from custom_components.rn_collectes.scanner import UnsupportedFeature, scan_ics
+from custom_components.rn_collectes.schedule import Schedule
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=TIMEZONE)
+
+
+def _calendar(*events: str) -> bytes:
+    """Assembler un calendrier à partir de VEVENT bruts."""
+    body = "".join(f"BEGIN:VEVENT\r\n{event.strip()}\r\nEND:VEVENT\r\n" for event in events)
+    return f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//tests//FR\r\n{body}END:VCALENDAR\r\n".encode()
+
+
+# Calendriers lus par le lecteur rapide, autour de la date des tests
+SUPPORTED = {
+    "city": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260105\r\nSUMMARY:Collecte des Déchets\r\n"
+        "DESCRIPTION:Bac noir\r\nRRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO",
+        "UID:2\r\nDTSTART;VALUE=DATE:20260112\r\nSUMMARY:Récupération\r\n"
+        "DESCRIPTION:Bac bleu\r\nRRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO",
+        "UID:3\r\nDTSTART;VALUE=DATE:20261107\r\nSUMMARY:Encombrants",
+    ),
+    "count-exdate": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260831\r\nSUMMARY:Compost\r\n"
+        "RRULE:FREQ=WEEKLY;COUNT=40;BYDAY=MO,TH\r\n"
+        "EXDATE;VALUE=DATE:20261019,20261022"
+    ),
+    "daily": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260901\r\nSUMMARY:Déchets\r\n"
+        "RRULE:FREQ=DAILY;INTERVAL=10"
+    ),
+    "until": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260602\r\nSUMMARY:Résidus verts\r\n"
+        "RRULE:FREQ=WEEKLY;INTERVAL=4;BYDAY=TU;UNTIL=20261201\r\nX-APPLE-TRAVEL:1"
+    ),
+    "text": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260907\r\n"
+        "SUMMARY;LANGUAGE=fr:Récupération\\, bac bleu\r\n"
+        "DESCRIPTION:Première ligne\\nDeuxième ligne\\; très long texte replié sur\r\n"
+        "  plusieurs lignes\r\nRRULE:FREQ=WEEKLY;INTERVAL=3"
+    ),
+}
+
+# Calendriers renvoyés aux bibliothèques
+UNSUPPORTED = {
+    "tzid": _calendar(
+        "UID:1\r\nDTSTART;TZID=America/Toronto:20260105T070000\r\nSUMMARY:Déchets\r\n"
+        "RRULE:FREQ=WEEKLY"
+    ),
+    "monthly": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260105\r\nSUMMARY:Déchets\r\nRRULE:FREQ=MONTHLY;BYDAY=1MO"
+    ),
+    "recurrence-id": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260105\r\nSUMMARY:Déchets\r\nRRULE:FREQ=WEEKLY",
+        "UID:1\r\nRECURRENCE-ID;VALUE=DATE:20261019\r\nDTSTART;VALUE=DATE:20261020\r\nSUMMARY:Déchets",
+    ),
+    "rdate": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260105\r\nSUMMARY:Déchets\r\nRDATE;VALUE=DATE:20261026"
+    ),
+    "byday-outside-dtstart": _calendar(
+        "UID:1\r\nDTSTART;VALUE=DATE:20260106\r\nSUMMARY:Déchets\r\nRRULE:FREQ=WEEKLY;BYDAY=MO"
+    ),
+}
+
+
+def _rows(schedule: Schedule) -> list[tuple]:
+    """Retourner les occurrences d'un calendrier sous une forme comparable."""
+    types = {
+        index: collecte_type
+        for collecte_type, indices in schedule.by_type.items()
+        for index in indices
+    }
+    return [
+        (event.date, event.summary, event.description, types.get(index))
+        for index, event in enumerate(schedule.events())
+    ]
+
+
+@pytest.mark.parametrize("content", SUPPORTED.values(), ids=SUPPORTED)
+def test_scanner_matches_library(freezer, content: bytes) -> None:
+    """Le lecteur rapide donne exactement les occurrences des bibliothèques."""
+    freezer.move_to(NOW)
+    fast = EventExpansion(content)
+
+    assert fast.scanned
+    expected = _rows(EventExpansion(content, use_scanner=False).slide())
+    assert expected
+    assert _rows(fast.slide()) == expected
+
+
+@pytest.mark.parametrize("content", UNSUPPORTED.values(), ids=UNSUPPORTED)
+def test_unsupported_falls_back_to_library(freezer, content: bytes) -> None:
+    """Un calendrier non pris en charge est lu par les bibliothèques."""
+    freezer.move_to(NOW)
+    with pytest.raises(UnsupportedFeature):
+        scan_ics(content)
+
+    expansion = EventExpansion(content)
+
+    assert not expansion.scanned
+    assert _rows(expansion.slide()) == _rows(
+        EventExpansion(content, use_scanner=False).slide()
+    )
+
+
+def test_scan_text_and_exdates() -> None:
+    """Les textes sont dépliés et décodés, les dates exclues retirées."""
+    (text,) = scan_ics(SUPPORTED["text"])
+    assert text.summary == "Récupération, bac bleu"
+    assert text.description == (
+        "Première ligne\nDeuxième ligne; très long texte replié sur plusieurs lignes"
+    )
+
+    (compost,) = scan_ics(SUPPORTED["count-exdate"])
+    days = list(compost.occurrences(date(2026, 10, 15), date(2026, 10, 30)))
+    assert days == [date(2026, 10, 15), date(2026, 10, 26), date(2026, 10, 29)]
+
+
+def test_invalid_utf8_falls_back_to_library(freezer) -> None:
+    """Un fichier mal encodé n'empêche pas la lecture par les bibliothèques."""
+    freezer.move_to(NOW)
+    content = SUPPORTED["city"].replace("Bac noir".encode(), "Bac noir \xe9".encode("latin-1"))
+
+    expansion = EventExpansion(content)
+
+    assert not expansion.scanned
+    assert expansion.slide()